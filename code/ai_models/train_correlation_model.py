@@ -21,6 +21,7 @@ class CorrelationPredictor:
         self.n_features = n_features
         self.scaler = MinMaxScaler(feature_range=(0, 1))
         self.model = self._build_model()
+        self._predict_fn = None
 
     def _build_model(self) -> Any:
         """Builds the LSTM model for correlation prediction."""
@@ -44,6 +45,20 @@ class CorrelationPredictor:
         logger.info("LSTM Model built successfully.")
         return model
 
+    def compile_inference(self) -> None:
+        """
+        Wraps the model's forward pass in a tf.function with a fixed float32
+        input signature and traces it once, so predictions reuse one graph.
+        Call again after replacing self.model.
+        """
+        input_shape = tuple(self.model.input_shape[1:])
+        model = self.model
+        self._predict_fn = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec((None, *input_shape), tf.float32)],
+        )
+        self._predict_fn(np.zeros((1, *input_shape), dtype=np.float32))
+
     def _calculate_volatility(self, prices: pd.Series, window: Any = 14) -> pd.Series:
         """Calculates historical volatility (standard deviation of log returns)."""
         log_returns = np.log(prices / prices.shift(1))
@@ -55,6 +70,10 @@ class CorrelationPredictor:
         Input (X): sequence_length days of price and volatility data.
         Target (y): Flattened correlation matrix for the day immediately following the sequence.
         """
+        if self.sequence_length < 2:
+            raise ValueError(
+                "sequence_length must be at least 2 to compute window correlations."
+            )
         data = df.copy()
         asset_cols = [col for col in data.columns if col.startswith("asset_")]
         if not asset_cols:
@@ -67,14 +86,15 @@ class CorrelationPredictor:
         features = data[[col for col in data.columns if col not in asset_cols]]
         self.n_features = features.shape[1]
         scaled_features = self.scaler.fit_transform(features)
+        # Simple returns for the whole history, once; window i covers prices
+        # [i - sequence_length, i), i.e. returns [i - sequence_length, i - 1).
+        prices = data[asset_cols].to_numpy(dtype=np.float64)
+        returns = prices[1:] / prices[:-1] - 1
         X, y = ([], [])
         for i in range(self.sequence_length, len(data)):
             X.append(scaled_features[i - self.sequence_length : i])
-            window_prices = data[asset_cols].iloc[i - self.sequence_length : i]
-            window_returns = window_prices.pct_change().dropna()
-            if window_returns.empty:
-                continue
-            corr_matrix = window_returns.corr().values
+            window_returns = returns[i - self.sequence_length : i - 1]
+            corr_matrix = np.corrcoef(window_returns, rowvar=False)
             y.append(corr_matrix.flatten())
         return (np.array(X), np.array(y))
 
@@ -154,8 +174,11 @@ class CorrelationPredictor:
             self.sequence_length
         )
         scaled_features = self.scaler.transform(features)
-        X_pred = np.expand_dims(scaled_features, axis=0)
-        flattened_corr = self.model.predict(X_pred)[0]
+        X_pred = np.expand_dims(scaled_features, axis=0).astype(np.float32)
+        if self._predict_fn is not None:
+            flattened_corr = self._predict_fn(X_pred).numpy()[0]
+        else:
+            flattened_corr = self.model.predict(X_pred)[0]
         n_assets = len(asset_cols)
         corr_matrix = flattened_corr.reshape(n_assets, n_assets)
         corr_matrix = (corr_matrix + corr_matrix.T) / 2
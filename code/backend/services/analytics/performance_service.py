@@ -7,6 +7,7 @@ import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from decimal import Decimal
+from types import MappingProxyType
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 import numpy as np
@@ -15,8 +16,75 @@ from services.market.market_data_service import MarketDataService
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+try:
+    from numba import njit
+
+    HAS_NUMBA = True
+except (ImportError, ModuleNotFoundError):
+    njit = None
+    HAS_NUMBA = False
+
 logger = logging.getLogger(__name__)
 
+# Look-back window in days per reporting period; unknown periods use one year.
+_PERIOD_DAYS = MappingProxyType(
+    {"1d": 1, "7d": 7, "30d": 30, "90d": 90, "1y": 365, "3y": 1095, "5y": 1825}
+)
+# Length in years used to annualize each period; unknown periods are sized
+# from the number of trading days in the series.
+_PERIOD_YEARS = MappingProxyType(
+    {
+        "1d": 1 / 365,
+        "7d": 7 / 365,
+        "30d": 30 / 365,
+        "90d": 90 / 365,
+        "1y": 1,
+        "3y": 3,
+        "5y": 5,
+    }
+)
+
+if HAS_NUMBA:
+
+    @njit("float64(float64[:])", cache=True, fastmath=True)
+    def _max_drawdown_kernel(returns):
+        """Largest peak-to-trough decline of the compounded returns"""
+        cumulative = 1.0
+        peak = 0.0
+        max_drawdown = 0.0
+        for i in range(returns.shape[0]):
+            cumulative *= 1.0 + returns[i]
+            if i == 0 or cumulative > peak:
+                peak = cumulative
+            drawdown = (peak - cumulative) / peak
+            if drawdown > max_drawdown:
+                max_drawdown = drawdown
+        return max_drawdown
+
+    @njit("float64(float64[:], float64)", cache=True, fastmath=True)
+    def _tail_mean_kernel(returns, threshold):
+        """Mean of the returns at or below threshold, NaN if there are none"""
+        total = 0.0
+        count = 0
+        for i in range(returns.shape[0]):
+            if returns[i] <= threshold:
+                total += returns[i]
+                count += 1
+        return total / count if count > 0 else np.nan
+
+else:
+    _max_drawdown_kernel = None
+    _tail_mean_kernel = None
+
+
+def _simple_returns(values: np.ndarray) -> List[float]:
+    """Step returns of a value series, skipping steps from a non-positive value"""
+    previous = values[:-1]
+    valid = previous > 0
+    returns = np.subtract(values[1:], previous)
+    np.divide(returns, previous, out=returns, where=valid)
+    return returns[valid].tolist()
+
 
 @dataclass
 class PerformanceData:
@@ -373,22 +441,7 @@ class PerformanceService:
     def _get_date_range(self, period: str) -> Tuple[datetime, datetime]:
         """Get start and end dates for period"""
         end_date = datetime.utcnow()
-        if period == "1d":
-            start_date = end_date - timedelta(days=1)
-        elif period == "7d":
-            start_date = end_date - timedelta(days=7)
-        elif period == "30d":
-            start_date = end_date - timedelta(days=30)
-        elif period == "90d":
-            start_date = end_date - timedelta(days=90)
-        elif period == "1y":
-            start_date = end_date - timedelta(days=365)
-        elif period == "3y":
-            start_date = end_date - timedelta(days=1095)
-        elif period == "5y":
-            start_date = end_date - timedelta(days=1825)
-        else:
-            start_date = end_date - timedelta(days=365)
+        start_date = end_date - timedelta(days=_PERIOD_DAYS.get(period, 365))
         return (start_date, end_date)
 
     async def _get_portfolio_returns(
@@ -401,14 +454,7 @@ class PerformanceService:
             )
             if len(daily_values) < 2:
                 return []
-            returns = []
-            for i in range(1, len(daily_values)):
-                prev_value = daily_values[i - 1]["value"]
-                curr_value = daily_values[i]["value"]
-                if prev_value > 0:
-                    daily_return = (curr_value - prev_value) / prev_value
-                    returns.append(daily_return)
-            return returns
+            return self._calculate_returns_from_values(daily_values)
         except Exception as e:
             logger.error(f"Error getting portfolio returns: {e}")
             return []
@@ -441,14 +487,12 @@ class PerformanceService:
             )
             if len(historical_data) < 2:
                 return []
-            returns = []
-            for i in range(1, len(historical_data)):
-                prev_price = historical_data[i - 1].close_price
-                curr_price = historical_data[i].close_price
-                if prev_price > 0:
-                    daily_return = float((curr_price - prev_price) / prev_price)
-                    returns.append(daily_return)
-            return returns
+            prices = np.fromiter(
+                (float(md.close_price) for md in historical_data),
+                dtype=np.float64,
+                count=len(historical_data),
+            )
+            return _simple_returns(prices)
         except Exception as e:
             logger.error(f"Error getting benchmark returns: {e}")
             return []
@@ -488,13 +532,12 @@ class PerformanceService:
             benchmark_array = np.array(benchmark_returns)
             benchmark_return = self._calculate_total_return(benchmark_returns)
             excess_return = total_return - benchmark_return
-            if np.var(benchmark_array) > 0:
-                beta = Decimal(
-                    str(
-                        np.cov(returns_array, benchmark_array)[0, 1]
-                        / np.var(benchmark_array)
-                    )
-                )
+            # One 2x2 population moment matrix serves beta and r-squared.
+            moments = np.cov(returns_array, benchmark_array, bias=True)
+            n = len(returns_array)
+            if moments[1, 1] > 0:
+                # Sample covariance over population variance, as np.cov / np.var
+                beta = Decimal(str(moments[0, 1] * n / (n - 1) / moments[1, 1]))
                 alpha = annualized_return - (
                     Decimal("0.02")
                     + beta
@@ -507,8 +550,9 @@ class PerformanceService:
             tracking_error = Decimal(str(np.std(excess_returns) * np.sqrt(252)))
             if tracking_error > 0:
                 information_ratio = excess_return / tracking_error
-            if len(returns_array) > 1 and len(benchmark_array) > 1:
-                correlation = np.corrcoef(returns_array, benchmark_array)[0, 1]
+            if n > 1:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    correlation = moments[0, 1] / np.sqrt(moments[0, 0] * moments[1, 1])
                 r_squared = (
                     Decimal(str(correlation**2))
                     if not np.isnan(correlation)
@@ -567,21 +611,8 @@ class PerformanceService:
         if not returns:
             return Decimal("0.0")
         total_return = self._calculate_total_return(returns)
-        if period == "1d":
-            years = 1 / 365
-        elif period == "7d":
-            years = 7 / 365
-        elif period == "30d":
-            years = 30 / 365
-        elif period == "90d":
-            years = 90 / 365
-        elif period == "1y":
-            years = 1
-        elif period == "3y":
-            years = 3
-        elif period == "5y":
-            years = 5
-        else:
+        years = _PERIOD_YEARS.get(period)
+        if years is None:
             years = len(returns) / 252
         if years <= 0:
             return total_return
@@ -631,12 +662,15 @@ class PerformanceService:
         """Calculate maximum drawdown"""
         if not returns:
             return Decimal("0.0")
-        returns_array = np.array(returns)
-        cumulative_returns = np.cumprod(1 + returns_array)
-        running_max = np.maximum.accumulate(cumulative_returns)
-        drawdown = (cumulative_returns - running_max) / running_max
-        max_drawdown = np.min(drawdown)
-        return Decimal(str(abs(max_drawdown)))
+        returns_array = np.array(returns, dtype=np.float64)
+        if HAS_NUMBA:
+            return Decimal(str(_max_drawdown_kernel(returns_array)))
+        cumulative = returns_array
+        cumulative += 1.0
+        np.cumprod(cumulative, out=cumulative)
+        running_max = np.maximum.accumulate(cumulative)
+        np.divide(cumulative, running_max, out=cumulative)
+        return Decimal(str(1.0 - cumulative.min()))
 
     def _calculate_calmar_ratio(self, returns: List[float]) -> Decimal:
         """Calculate Calmar ratio"""
@@ -659,11 +693,16 @@ class PerformanceService:
         """Calculate Conditional Value at Risk"""
         if not returns:
             return Decimal("0.0")
-        returns_array = np.array(returns)
+        returns_array = np.array(returns, dtype=np.float64)
         percentile = (1 - confidence_level) * 100
-        var_threshold = np.percentile(returns_array, percentile)
-        tail_returns = returns_array[returns_array <= var_threshold]
-        cvar = np.mean(tail_returns) if len(tail_returns) > 0 else var_threshold
+        var_threshold = float(np.percentile(returns_array, percentile))
+        if HAS_NUMBA:
+            cvar = _tail_mean_kernel(returns_array, var_threshold)
+        else:
+            tail = returns_array <= var_threshold
+            cvar = returns_array.mean(where=tail) if tail.any() else np.nan
+        if np.isnan(cvar):
+            cvar = var_threshold
         return Decimal(str(abs(cvar)))
 
     def _calculate_capture_ratios(
@@ -725,14 +764,13 @@ class PerformanceService:
         """Calculate returns from portfolio values"""
         if len(values) < 2:
             return []
-        returns = []
-        for i in range(1, len(values)):
-            prev_value = values[i - 1]["value"]
-            curr_value = values[i]["value"]
-            if prev_value > 0:
-                daily_return = (curr_value - prev_value) / prev_value
-                returns.append(daily_return)
-        return returns
+        return _simple_returns(
+            np.fromiter(
+                (float(entry["value"]) for entry in values),
+                dtype=np.float64,
+                count=len(values),
+            )
+        )
 
     def _calculate_percentile(self, value: float, peer_values: List[float]) -> float:
         """Calculate percentile rank of value in peer group"""
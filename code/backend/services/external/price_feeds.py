@@ -403,26 +403,24 @@ class PriceFeedManager:
             return None
 
     async def _check_feed_health(self):
-        """Check health of all price feeds"""
+        """
+        Check health of all price feeds. Sources are probed concurrently, so
+        one clock read after the probes stamps every source and the sweep.
+        """
         try:
             test_symbols = ["BTC", "ETH"]
-            for source in self.aggregator.sources:
-                source_name = source.__class__.__name__
-                healthy = True
-                for symbol in test_symbols:
-                    try:
-                        price = await source.get_price(symbol)
-                        if price is None or price <= 0:
-                            healthy = False
-                            break
-                    except Exception:
-                        healthy = False
-                        break
-                self.health_status[source_name] = {
+            sources = self.aggregator.sources
+            results = await asyncio.gather(
+                *(self._probe_feed(source, test_symbols) for source in sources)
+            )
+            checked_at = datetime.now()
+            last_check = checked_at.isoformat()
+            for source, healthy in zip(sources, results):
+                self.health_status[source.__class__.__name__] = {
                     "healthy": healthy,
-                    "last_check": datetime.now().isoformat(),
+                    "last_check": last_check,
                 }
-            self.last_health_check = datetime.now()
+            self.last_health_check = checked_at
             unhealthy_sources = [
                 name
                 for name, status in self.health_status.items()
@@ -433,6 +431,17 @@ class PriceFeedManager:
         except Exception as e:
             logger.error(f"Error checking feed health: {e}")
 
+    async def _probe_feed(self, source: Any, symbols: List[str]) -> bool:
+        """Whether a source returns a positive price for every test symbol"""
+        for symbol in symbols:
+            try:
+                price = await source.get_price(symbol)
+            except Exception:
+                return False
+            if price is None or price <= 0:
+                return False
+        return True
+
     async def _get_historical_prices(
         self, symbol: str, days: int = 10
     ) -> List[Decimal]:
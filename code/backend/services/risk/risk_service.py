@@ -3,20 +3,28 @@ Risk Management Service for Financial Industry Applications
 Comprehensive risk assessment, monitoring, and management with regulatory compliance
 """
 
+import asyncio
+import bisect
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from uuid import UUID
 import numpy as np
 from models.portfolio import Portfolio
 from models.risk import RiskAssessment
 from models.user import RiskLevel, UserRiskProfile
-from scipy import stats
+from scipy.special import ndtri
 from services.market.market_data_service import MarketDataService
 import os
 import sys
+import time
 from pathlib import Path
 
 # Add ai_models to path
@@ -25,21 +33,331 @@ if str(ai_models_path) not in sys.path:
     sys.path.insert(0, str(ai_models_path))
 
 try:
-    from train_correlation_model import CorrelationPredictor
-    import tensorflow as tf
+    from numba import njit, prange
 
-    HAS_ML_MODEL = True
+    HAS_NUMBA = True
 except (ImportError, ModuleNotFoundError):
-    CorrelationPredictor = None
-    tf = None
-    HAS_ML_MODEL = False
-from sqlalchemy import and_, select
+    njit = None
+    prange = None
+    HAS_NUMBA = False
+from sqlalchemy import Select, and_, bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 logger = logging.getLogger(__name__)
 
+# Questionnaire score deltas; age and income are indexed by how many of their
+# bracket boundaries the answer has crossed.
+_AGE_SCORES = (15, 5, -10)
+_INCOME_SCORES = (-10, 0, 10)
+_EXPERIENCE_SCORES = {"beginner": -15, "moderate": 0, "experienced": 15, "expert": 25}
+_TOLERANCE_SCORES = {
+    "conservative": -20,
+    "moderate": 0,
+    "aggressive": 20,
+    "very_aggressive": 30,
+}
+_HORIZON_SCORES = {"short": -10, "medium": 0, "long": 10, "very_long": 15}
+
+# Upper bounds (inclusive) of each band; scores above the last bound get the
+# final label.
+_GRADE_THRESHOLDS = (20.0, 40.0, 60.0, 80.0)
+_GRADES = ("Very Low", "Low", "Medium", "High", "Very High")
+_USER_RISK_THRESHOLDS = (25.0, 50.0, 75.0)
+_USER_RISK_LEVELS = (
+    RiskLevel.LOW,
+    RiskLevel.MEDIUM,
+    RiskLevel.HIGH,
+    RiskLevel.CRITICAL,
+)
+
+# Per-level limits before the income adjustment.
+_BASE_LIMITS = MappingProxyType(
+    {
+        RiskLevel.LOW: MappingProxyType(
+            {
+                "daily_transaction_limit": 1000.0,
+                "monthly_transaction_limit": 10000.0,
+                "max_portfolio_value": 50000.0,
+                "max_single_asset_allocation": 0.20,
+            }
+        ),
+        RiskLevel.MEDIUM: MappingProxyType(
+            {
+                "daily_transaction_limit": 5000.0,
+                "monthly_transaction_limit": 50000.0,
+                "max_portfolio_value": 250000.0,
+                "max_single_asset_allocation": 0.30,
+            }
+        ),
+        RiskLevel.HIGH: MappingProxyType(
+            {
+                "daily_transaction_limit": 25000.0,
+                "monthly_transaction_limit": 250000.0,
+                "max_portfolio_value": 1000000.0,
+                "max_single_asset_allocation": 0.50,
+            }
+        ),
+        RiskLevel.CRITICAL: MappingProxyType(
+            {
+                "daily_transaction_limit": 100000.0,
+                "monthly_transaction_limit": 1000000.0,
+                "max_portfolio_value": 10000000.0,
+                "max_single_asset_allocation": 0.70,
+            }
+        ),
+    }
+)
+
+# Share of an asset type's value that can be liquidated quickly; types not
+# listed score 0.5.
+_LIQUIDITY_SCORES = MappingProxyType(
+    {
+        "cryptocurrency": 0.8,
+        "stock": 0.9,
+        "bond": 0.7,
+        "commodity": 0.6,
+        "real_estate": 0.2,
+        "private_equity": 0.1,
+    }
+)
+
+# (metric, threshold, alert type, severity, message template); an alert fires
+# when the metric is above its threshold.
+_RISK_THRESHOLD_ALERTS = (
+    ("var_1d", 0.10, "var_breach", "high", "Daily VaR exceeds 10%: {:.2%}"),
+    (
+        "overall_risk_score",
+        80.0,
+        "high_risk_score",
+        "high",
+        "Overall risk score is very high: {:.1f}",
+    ),
+    (
+        "volatility",
+        0.50,
+        "high_volatility",
+        "medium",
+        "Portfolio volatility is very high: {:.2%}",
+    ),
+)
+# Recommendation per monitoring alert type, formatted with the alert's fields.
+_MONITORING_RECOMMENDATIONS = MappingProxyType(
+    {
+        "var_breach": "Reduce position sizes or add hedging to lower VaR",
+        "high_risk_score": "Review portfolio allocation and consider risk reduction",
+        "high_volatility": (
+            "Add stable assets or implement volatility reduction strategies"
+        ),
+        "concentration_limit": (
+            "Reduce allocation to {asset} to improve diversification"
+        ),
+    }
+)
+# (metric, threshold, recommendation) for metrics that are too high ...
+_RECOMMENDATION_CEILINGS = (
+    ("var_1d", 0.10, "Consider reducing position sizes to lower daily Value at Risk"),
+    (
+        "concentration_risk",
+        50.0,
+        "Portfolio is highly concentrated - consider diversifying across more assets",
+    ),
+    ("liquidity_risk", 30.0, "Consider increasing allocation to more liquid assets"),
+    (
+        "volatility",
+        0.30,
+        "Portfolio volatility is high - consider adding stable assets or hedging",
+    ),
+)
+# ... and for metrics that are too low.
+_RECOMMENDATION_FLOORS = (
+    (
+        "sharpe_ratio",
+        0.5,
+        "Risk-adjusted returns are low - review asset selection and allocation",
+    ),
+)
+
+if HAS_NUMBA:
+
+    @njit(
+        "void(float64[:], float64[:], float64[:], float64[:])",
+        cache=True,
+        fastmath=True,
+    )
+    def _stress_kernel(values, shocks, out_loss, out_stressed):
+        """Per-asset stress loss and stressed value in a single pass"""
+        for i in range(values.shape[0]):
+            loss = values[i] * abs(shocks[i])
+            out_loss[i] = loss
+            out_stressed[i] = values[i] - loss
+
+    @njit(
+        "void(float64[:], intp[:], intp[:], float64[:, :], float64[:, :])",
+        cache=True,
+        fastmath=True,
+        parallel=True,
+    )
+    def _batch_stress_kernel(values, columns, offsets, scenario_matrix, out_loss):
+        """Stress loss of every (portfolio, scenario) pair, portfolios in parallel"""
+        for p in prange(offsets.shape[0] - 1):
+            for s in range(scenario_matrix.shape[0]):
+                total = 0.0
+                for i in range(offsets[p], offsets[p + 1]):
+                    total += values[i] * abs(scenario_matrix[s, columns[i]])
+                out_loss[p, s] = total
+
+    @njit(cache=True, fastmath=True)
+    def _tail_kernel(returns, k):
+        """k-th smallest return and the mean of the k smallest"""
+        partitioned = np.partition(returns, k - 1)
+        total = 0.0
+        for i in range(k):
+            total += partitioned[i]
+        return partitioned[k - 1], total / k
+
+    @njit(cache=True, fastmath=True)
+    def _return_kernel(returns, daily_risk_free):
+        """Mean, std, downside std and max drawdown of a series in one pass"""
+        n = 0
+        mean = 0.0
+        m2 = 0.0
+        downside_n = 0
+        downside_mean = 0.0
+        downside_m2 = 0.0
+        cumulative = 1.0
+        peak = 0.0
+        max_drawdown = 0.0
+        for i in range(returns.shape[0]):
+            r = returns[i]
+            n += 1
+            delta = r - mean
+            mean += delta / n
+            m2 += delta * (r - mean)
+            if r < daily_risk_free:
+                downside_n += 1
+                delta = r - downside_mean
+                downside_mean += delta / downside_n
+                downside_m2 += delta * (r - downside_mean)
+            cumulative *= 1.0 + r
+            if i == 0 or cumulative > peak:
+                peak = cumulative
+            drawdown = (peak - cumulative) / peak
+            if drawdown > max_drawdown:
+                max_drawdown = drawdown
+        std = np.sqrt(m2 / n) if n > 0 else 0.0
+        downside_std = np.sqrt(downside_m2 / downside_n) if downside_n > 0 else 0.0
+        return mean, std, downside_std, max_drawdown
+
+else:
+    _stress_kernel = None
+    _batch_stress_kernel = None
+    _tail_kernel = None
+    _return_kernel = None
+
+
+@lru_cache(maxsize=None)
+def _warm_risk_kernels() -> None:
+    """Compile the lazily typed kernels once per process"""
+    dummy = np.zeros(252)
+    _tail_kernel(dummy, 12)
+    _return_kernel(dummy, 0.0)
+    dummy.flags.writeable = False
+    _tail_kernel(dummy, 12)
+    _return_kernel(dummy, 0.0)
+
+
+def _to_decimal(value: float) -> Decimal:
+    """Decimal with the shortest repr of a float64 metric"""
+    return Decimal(repr(float(value)))
+
+
+@lru_cache(maxsize=None)
+def _normal_quantile(probability: float) -> float:
+    """Standard normal quantile, memoized per confidence level"""
+    return float(ndtri(probability))
+
+
+def _load_correlation_model(path: str) -> Any:
+    """
+    Import TensorFlow and load the correlation model. Only reached when the
+    model file exists, so workers without a model never pay for the
+    TensorFlow import.
+    """
+    from train_correlation_model import CorrelationPredictor
+    import tensorflow as tf
+
+    predictor = CorrelationPredictor()
+    predictor.model = tf.keras.models.load_model(path)
+    predictor.compile_inference()
+    return predictor
+
+
+class MockCorrelationPredictor:
+    """Identity correlation used when no trained model is available"""
+
+    def predict(self, df: Any) -> np.ndarray:
+        shape = getattr(df, "shape", ())
+        n_assets = shape[1] if len(shape) == 2 else 3
+        return np.identity(n_assets)
+
+
+_MOCK_CORRELATION_PREDICTOR = MockCorrelationPredictor()
+
+
+@lru_cache(maxsize=16)
+def _synthetic_portfolio_returns(days: int) -> np.ndarray:
+    """
+    Seeded daily portfolio returns. The series depends only on `days`, so it
+    is generated once per process and shared read-only by every service.
+    """
+    returns = np.random.default_rng(42).standard_normal(days)
+    returns *= 0.02
+    returns += 0.0008
+    returns.flags.writeable = False
+    return returns
+
+
+@lru_cache(maxsize=256)
+def _liquidity_vector(asset_types: Tuple[Any, ...]) -> np.ndarray:
+    """Read-only liquidity scores aligned with an asset type layout"""
+    scores = np.fromiter(
+        (_LIQUIDITY_SCORES.get(asset_type, 0.5) for asset_type in asset_types),
+        dtype=np.float64,
+        count=len(asset_types),
+    )
+    scores.flags.writeable = False
+    return scores
+
+
+@lru_cache(maxsize=None)
+def _portfolio_stmt(with_user: bool) -> Select:
+    """Build the portfolio lookup once per shape; values are bound per call"""
+    conditions = [
+        Portfolio.id == bindparam("portfolio_id"),
+        Portfolio.is_deleted == False,
+    ]
+    if with_user:
+        conditions.append(Portfolio.user_id == bindparam("user_id"))
+    return (
+        select(Portfolio)
+        .options(selectinload(Portfolio.assets))
+        .where(and_(*conditions))
+    )
+
+
+@lru_cache(maxsize=None)
+def _latest_assessment_stmt() -> Select:
+    """Build the latest risk assessment lookup once"""
+    return (
+        select(RiskAssessment)
+        .where(RiskAssessment.portfolio_id == bindparam("portfolio_id"))
+        .order_by(RiskAssessment.assessment_date.desc())
+        .limit(1)
+    )
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RiskMetricsData:
     """Risk metrics data structure"""
 
@@ -54,7 +372,8 @@ class RiskMetricsData:
     beta: Decimal
     alpha: Decimal
     volatility: Decimal
-    correlation_matrix: Dict[str, Dict[str, float]]
+    correlation_symbols: List[str]
+    correlation_values: np.ndarray
     concentration_risk: Decimal
     liquidity_risk: Decimal
     credit_risk: Decimal
@@ -64,8 +383,24 @@ class RiskMetricsData:
     risk_grade: str
     timestamp: datetime
 
+    @property
+    def correlation_matrix(self) -> Dict[str, Dict[str, float]]:
+        """Correlation matrix as nested dicts, built only when serialized"""
+        size = len(self.correlation_symbols)
+        if self.correlation_values.shape != (size, size):
+            raise ValueError(
+                f"Correlation values of shape {self.correlation_values.shape} "
+                f"do not match {size} symbols"
+            )
+        return {
+            symbol: dict(zip(self.correlation_symbols, row))
+            for symbol, row in zip(
+                self.correlation_symbols, self.correlation_values.tolist()
+            )
+        }
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StressTestScenario:
     """Stress test scenario definition"""
 
@@ -77,431 +412,216 @@ class StressTestScenario:
     duration_days: int
 
 
-class RiskService:
-    CORRELATION_MODEL_PATH = os.path.join(
-        os.path.dirname(__file__), "..", "..", "ai_models", "correlation_model.h5"
-    )
-    "\n    Comprehensive risk management service with advanced analytics\n    "
-
-    def __init__(self, db: AsyncSession) -> None:
-        self.db = db
-        self.market_data_service = MarketDataService()
-        self.correlation_predictor = self._load_correlation_predictor()
-        self.var_thresholds = {
-            RiskLevel.LOW: Decimal("0.02"),
-            RiskLevel.MEDIUM: Decimal("0.05"),
-            RiskLevel.HIGH: Decimal("0.10"),
-            RiskLevel.CRITICAL: Decimal("0.20"),
-        }
-        self.stress_scenarios = [
-            StressTestScenario(
-                name="Market Crash",
-                description="Severe market downturn similar to 2008 financial crisis",
-                market_shocks={"BTC": -0.5, "ETH": -0.6, "stocks": -0.4},
-                correlation_changes={"all": 0.8},
-                volatility_multiplier=3.0,
-                duration_days=30,
-            ),
-            StressTestScenario(
-                name="Crypto Winter",
-                description="Extended cryptocurrency bear market",
-                market_shocks={"BTC": -0.8, "ETH": -0.85, "altcoins": -0.9},
-                correlation_changes={"crypto": 0.9},
-                volatility_multiplier=2.5,
-                duration_days=365,
-            ),
-            StressTestScenario(
-                name="Interest Rate Shock",
-                description="Rapid interest rate increases",
-                market_shocks={"bonds": -0.2, "stocks": -0.15, "crypto": -0.3},
-                correlation_changes={"traditional": 0.6},
-                volatility_multiplier=1.8,
-                duration_days=90,
-            ),
-            StressTestScenario(
-                name="Liquidity Crisis",
-                description="Market liquidity dries up",
-                market_shocks={"all": -0.25},
-                correlation_changes={"all": 0.95},
-                volatility_multiplier=4.0,
-                duration_days=14,
-            ),
-        ]
-
-    def _load_correlation_predictor(self) -> Any:
-        """Loads the correlation prediction model."""
-        try:
-            if not HAS_ML_MODEL:
-                logger.warning(
-                    "TensorFlow or correlation model not available. Using mock predictor."
-                )
-
-                class MockCorrelationPredictor:
-                    def predict(self, df: "pd.DataFrame") -> "pd.DataFrame":
-                        n_assets = 3
-                        corr = np.identity(n_assets)
-                        return corr
+@dataclass(slots=True, frozen=True)
+class PortfolioArrays:
+    """Holdings decoded column-wise, each aligned with portfolio.assets"""
 
-                return MockCorrelationPredictor()
+    symbols: Tuple[str, ...]
+    asset_types: Tuple[str, ...]
+    values: np.ndarray
+    total_value: float
+    weights: np.ndarray
 
-            if not os.path.exists(self.CORRELATION_MODEL_PATH):
-                logger.warning(
-                    f"Correlation model not found at {self.CORRELATION_MODEL_PATH}. Using a mock predictor."
-                )
 
-                class MockCorrelationPredictor:
-                    def predict(self, df: "pd.DataFrame") -> "pd.DataFrame":
-                        n_assets = 3
-                        corr = np.identity(n_assets)
-                        return corr
+@dataclass(slots=True, frozen=True)
+class StressTestContext:
+    """Per-portfolio asset arrays shared by every stress scenario"""
 
-                return MockCorrelationPredictor()
+    symbols: List[str]
+    asset_types: Tuple[str, ...]
+    values: np.ndarray
+    total_value: float
 
-            predictor = CorrelationPredictor()
-            predictor.model = tf.keras.models.load_model(self.CORRELATION_MODEL_PATH)
-            logger.info("Correlation prediction model loaded successfully.")
-            return predictor
-        except Exception as e:
-            logger.error(f"Failed to load correlation predictor: {e}")
 
-            class MockCorrelationPredictor:
-                def predict(self, df: "pd.DataFrame") -> "pd.DataFrame":
-                    n_assets = 3
-                    corr = np.identity(n_assets)
-                    return corr
+@dataclass(slots=True, frozen=True)
+class ReturnMoments:
+    """Mean and population standard deviation of a return series"""
 
-            return MockCorrelationPredictor()
+    mean: float
+    std: float
 
-    async def _get_portfolio_with_assets(
-        self, portfolio_id: UUID, user_id: UUID
-    ) -> Optional[Portfolio]:
-        """
-        Fetches the portfolio and its assets from the database.
-        (Placeholder for actual DB query)
-        """
 
-        class MockAsset:
+@dataclass(slots=True, frozen=True)
+class StressTestBatch:
+    """
+    Stress test outcome for every scenario: loss figures as parallel arrays
+    for the numeric consumers, plus the per-scenario records that get stored.
+    Scenarios whose record failed to build carry NaN loss percentages.
+    """
 
-            def __init__(self, symbol: Any, quantity: Any, price: Any) -> None:
-                self.symbol = symbol
-                self.quantity = Decimal(str(quantity))
-                self.price = Decimal(str(price))
+    scenario_names: List[str]
+    losses: np.ndarray
+    loss_percentages: np.ndarray
+    results: List[Dict[str, Any]]
 
-        class MockPortfolio:
 
-            def __init__(self, assets: Any) -> None:
-                self.assets = assets
+class RiskService:
+    CORRELATION_MODEL_PATH = os.path.join(
+        os.path.dirname(__file__), "..", "..", "ai_models", "correlation_model.h5"
+    )
+    SHOCK_CACHE_SIZE = 1024
+    METRICS_CACHE_SIZE = 256
+    SPECTRUM_CACHE_SIZE = 256
+    CORRELATION_CACHE_SIZE = 256
+    LOOKUP_CACHE_TTL_SECONDS = 30
+    var_thresholds = MappingProxyType(
+        {
+            RiskLevel.LOW: Decimal("0.02"),
+            RiskLevel.MEDIUM: Decimal("0.05"),
+            RiskLevel.HIGH: Decimal("0.10"),
+            RiskLevel.CRITICAL: Decimal("0.20"),
+        }
+    )
+    stress_scenarios = (
+        StressTestScenario(
+            name="Market Crash",
+            description="Severe market downturn similar to 2008 financial crisis",
+            market_shocks={"BTC": -0.5, "ETH": -0.6, "stocks": -0.4},
+            correlation_changes={"all": 0.8},
+            volatility_multiplier=3.0,
+            duration_days=30,
+        ),
+        StressTestScenario(
+            name="Crypto Winter",
+            description="Extended cryptocurrency bear market",
+            market_shocks={"BTC": -0.8, "ETH": -0.85, "altcoins": -0.9},
+            correlation_changes={"crypto": 0.9},
+            volatility_multiplier=2.5,
+            duration_days=365,
+        ),
+        StressTestScenario(
+            name="Interest Rate Shock",
+            description="Rapid interest rate increases",
+            market_shocks={"bonds": -0.2, "stocks": -0.15, "crypto": -0.3},
+            correlation_changes={"traditional": 0.6},
+            volatility_multiplier=1.8,
+            duration_days=90,
+        ),
+        StressTestScenario(
+            name="Liquidity Crisis",
+            description="Market liquidity dries up",
+            market_shocks={"all": -0.25},
+            correlation_changes={"all": 0.95},
+            volatility_multiplier=4.0,
+            duration_days=14,
+        ),
+    )
+    _correlation_predictor: Optional[Any] = None
+    _predictor_lock = threading.Lock()
+    _scenario_layout_cache: Optional[Tuple[Dict[str, int], np.ndarray]] = None
+    _shock_cache: "OrderedDict[Tuple[str, ...], np.ndarray]" = OrderedDict()
+    # numba falls back to the workqueue threading layer without TBB or OpenMP,
+    # and that layer aborts when two threads launch parallel kernels at once,
+    # so batch stress runs share one worker thread.
+    _stress_executor = ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="risk-stress"
+    )
+    _spectrum_cache: "OrderedDict[Tuple[Any, ...], Tuple[np.ndarray, np.ndarray]]" = (
+        OrderedDict()
+    )
+    _correlation_cache: "OrderedDict[Tuple[Any, ...], np.ndarray]" = OrderedDict()
+    _metrics_cache: "OrderedDict[Tuple[Any, ...], Tuple[float, RiskMetricsData]]" = (
+        OrderedDict()
+    )
+    _metrics_cache_lock = threading.Lock()
+    _metrics_locks: Dict[Tuple[Any, ...], asyncio.Lock] = {}
+    "\n    Comprehensive risk management service with advanced analytics\n    "
 
-        if str(portfolio_id) == "00000000-0000-0000-0000-000000000001":
-            assets = [
-                MockAsset("BTC", 1.5, 60000),
-                MockAsset("ETH", 10, 3000),
-                MockAsset("SOL", 50, 150),
-            ]
-            return MockPortfolio(assets)
-        return None
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+        self.market_data_service = MarketDataService()
+        self.correlation_predictor = self._load_correlation_predictor()
+        self._lookup_cache: Dict[Tuple[str, Any], Tuple[float, Any]] = {}
+        self._lookup_locks: Dict[Tuple[str, Any], asyncio.Lock] = {}
+        self._asset_arrays_cache: Dict[Any, Tuple[Any, PortfolioArrays]] = {}
+        self._shock_columns, self._scenario_matrix = self._scenario_layout()
+        if HAS_NUMBA:
+            _warm_risk_kernels()
+
+    @classmethod
+    def _scenario_layout(cls) -> Tuple[Dict[str, int], np.ndarray]:
+        """
+        Shock columns and scenario matrix, built once per process since the
+        scenarios are class constants. The per-layout shock LRU is class-level
+        for the same reason, so it survives the per-request service instances.
+        """
+        if cls._scenario_layout_cache is None:
+            cls._scenario_layout_cache = cls._build_scenario_matrix()
+        return cls._scenario_layout_cache
 
-    async def _calculate_risk_metrics(self, portfolio: Portfolio) -> RiskMetricsData:
+    @classmethod
+    def _build_scenario_matrix(cls) -> Tuple[Dict[str, int], np.ndarray]:
         """
-        Calculates core risk metrics for the portfolio.
+        Stack every scenario's shocks into a (scenarios, shock keys + 1) matrix.
+        The last column holds each scenario's "all" shock, used for asset types
+        that no scenario names explicitly.
         """
-        assets = portfolio.assets
-        if not assets:
-            return RiskMetricsData(
-                portfolio_id=portfolio.id,
-                var_1d=Decimal(0),
-                var_5d=Decimal(0),
-                var_30d=Decimal(0),
-                expected_shortfall=Decimal(0),
-                sharpe_ratio=Decimal(0),
-                sortino_ratio=Decimal(0),
-                max_drawdown=Decimal(0),
-                beta=Decimal(0),
-                alpha=Decimal(0),
-                volatility=Decimal(0),
-                correlation_matrix={},
-                concentration_risk=Decimal(0),
-                liquidity_risk=Decimal(0),
-                credit_risk=Decimal(0),
-                market_risk=Decimal(0),
-                operational_risk=Decimal(0),
-                overall_risk_score=Decimal(0),
-                risk_grade="N/A",
-                timestamp=datetime.utcnow(),
-            )
-        historical_days = 252
-        asset_symbols = [asset.symbol for asset in assets]
-        np.random.seed(42)
-        returns_data = {
-            symbol: np.random.normal(0.0005, 0.01, historical_days)
-            for symbol in asset_symbols
-        }
-        returns_df = pd.DataFrame(returns_data)
-        portfolio_value = sum((asset.quantity * asset.price for asset in assets))
-        weights = np.array(
-            [asset.quantity * asset.price / portfolio_value for asset in assets]
-        )
-        portfolio_returns = returns_df.dot(weights)
-        portfolio_volatility = Decimal(str(portfolio_returns.std() * np.sqrt(252)))
-        confidence_level = 0.01
-        var_1d = Decimal(str(np.percentile(portfolio_returns, confidence_level) * -1))
-        var_5d = var_1d * Decimal(str(np.sqrt(5)))
-        var_30d = var_1d * Decimal(str(np.sqrt(30)))
-        es_returns = portfolio_returns[
-            portfolio_returns <= np.percentile(portfolio_returns, confidence_level)
-        ]
-        expected_shortfall = Decimal(str(es_returns.mean() * -1))
-        risk_free_rate = 0.02
-        annual_return = portfolio_returns.mean() * 252
-        sharpe_ratio = Decimal(
-            str(
-                (annual_return - risk_free_rate)
-                / portfolio_returns.std()
-                / np.sqrt(252)
-            )
-        )
-        hhi = sum((w**2 for w in weights))
-        concentration_risk = Decimal(str(hhi))
-        mock_price_data = {
-            f"asset_{s.lower()}": np.cumsum(r) + float(assets[i].price)
-            for i, (s, r) in enumerate(returns_data.items())
-        }
-        mock_price_df = pd.DataFrame(mock_price_data)
-        try:
-            predicted_corr_matrix_np = self.correlation_predictor.predict(mock_price_df)
-            correlation_matrix = {
-                s1: {
-                    s2: predicted_corr_matrix_np[i][j]
-                    for j, s2 in enumerate(asset_symbols)
-                }
-                for i, s1 in enumerate(asset_symbols)
-            }
-        except Exception as e:
-            logger.error(
-                f"Correlation prediction failed: {e}. Using default correlation."
-            )
-            correlation_matrix = {
-                s: {s: 1.0 for s in asset_symbols} for s in asset_symbols
+        keys = sorted(
+            {
+                key
+                for scenario in cls.stress_scenarios
+                for key in scenario.market_shocks
+                if key != "all"
             }
-        overall_risk_score = (
-            var_30d * Decimal("0.4")
-            + expected_shortfall * Decimal("0.3")
-            + concentration_risk * Decimal("0.3")
         )
-        return RiskMetricsData(
-            portfolio_id=portfolio.id,
-            var_1d=var_1d,
-            var_5d=var_5d,
-            var_30d=var_30d,
-            expected_shortfall=expected_shortfall,
-            sharpe_ratio=sharpe_ratio,
-            sortino_ratio=Decimal(0),
-            max_drawdown=Decimal(0),
-            beta=Decimal(0),
-            alpha=Decimal(0),
-            volatility=portfolio_volatility,
-            correlation_matrix=correlation_matrix,
-            concentration_risk=concentration_risk,
-            liquidity_risk=Decimal(0),
-            credit_risk=Decimal(0),
-            market_risk=var_30d,
-            operational_risk=Decimal(0),
-            overall_risk_score=overall_risk_score,
-            risk_grade=self._determine_risk_grade(overall_risk_score),
-            timestamp=datetime.utcnow(),
-        )
-
-    async def _perform_stress_tests(self, portfolio: Portfolio) -> List[Dict[str, Any]]:
+        shock_columns = {key: column for column, key in enumerate(keys)}
+        matrix = np.empty((len(cls.stress_scenarios), len(keys) + 1))
+        for row, scenario in enumerate(cls.stress_scenarios):
+            default = scenario.market_shocks.get("all", 0.0)
+            for key, column in shock_columns.items():
+                matrix[row, column] = scenario.market_shocks.get(key, default)
+            matrix[row, -1] = default
+        return shock_columns, matrix
+
+    @classmethod
+    def _load_correlation_predictor(cls) -> Any:
         """
-        Simulates portfolio performance under various stress scenarios.
+        Loads the correlation prediction model once per process; every
+        RiskService instance shares the same predictor (or mock).
         """
-        results = []
-        assets = portfolio.assets
-        portfolio_value = sum((asset.quantity * asset.price for asset in assets))
-        for scenario in self.stress_scenarios:
-            simulated_value = portfolio_value
-            total_loss = Decimal(0)
-            for asset in assets:
-                shock_percent = scenario.market_shocks.get(
-                    asset.symbol, scenario.market_shocks.get("all", 0)
-                )
-                asset_value = asset.quantity * asset.price
-                loss_amount = asset_value * Decimal(str(shock_percent)) * Decimal("-1")
-                total_loss += loss_amount
-                simulated_value -= loss_amount
-            loss_percent = (
-                total_loss / portfolio_value * 100
-                if portfolio_value > 0
-                else Decimal(0)
+        if cls._correlation_predictor is not None:
+            return cls._correlation_predictor
+        with cls._predictor_lock:
+            if cls._correlation_predictor is None:
+                cls._correlation_predictor = cls._build_correlation_predictor()
+        return cls._correlation_predictor
+
+    @classmethod
+    def _build_correlation_predictor(cls) -> Any:
+        """Load the trained model, falling back to the mock predictor"""
+        if not os.path.exists(cls.CORRELATION_MODEL_PATH):
+            logger.warning(
+                f"Correlation model not found at {cls.CORRELATION_MODEL_PATH}. Using a mock predictor."
             )
-            results.append(
-                {
-                    "scenario_name": scenario.name,
-                    "description": scenario.description,
-                    "initial_value": float(portfolio_value),
-                    "simulated_value": float(simulated_value),
-                    "potential_loss_amount": float(total_loss),
-                    "potential_loss_percent": float(loss_percent),
-                }
+            return _MOCK_CORRELATION_PREDICTOR
+        try:
+            predictor = _load_correlation_model(cls.CORRELATION_MODEL_PATH)
+        except (ImportError, ModuleNotFoundError):
+            logger.warning(
+                "TensorFlow or correlation model not available. Using mock predictor."
             )
-        return results
+            return _MOCK_CORRELATION_PREDICTOR
+        except Exception as e:
+            logger.error(f"Failed to load correlation predictor: {e}")
+            return _MOCK_CORRELATION_PREDICTOR
+        logger.info("Correlation prediction model loaded successfully.")
+        return predictor
 
-    async def _calculate_overall_risk_score(
-        self, risk_metrics: RiskMetricsData, stress_test_results: List[Dict[str, Any]]
-    ) -> Decimal:
+    def _calculate_overall_risk_score(
+        self, risk_metrics: RiskMetricsData, stress_tests: StressTestBatch
+    ) -> float:
         """
-        Calculates the final overall risk score based on metrics and stress tests.
+        Final assessment score from the metrics and the worst stress loss.
+        The worst loss is read off the batch's loss percentages (NaN for
+        failed scenarios is ignored) rather than rescanning result dicts.
         """
-        max_stress_loss_percent = (
-            max(
-                [Decimal(str(r["potential_loss_percent"])) for r in stress_test_results]
-            )
-            / 100
-        )
+        max_stress_loss = np.fmax.reduce(stress_tests.loss_percentages, initial=0.0)
         score = (
-            (risk_metrics.var_30d + risk_metrics.expected_shortfall)
-            / 2
-            * Decimal("0.6")
-            + max_stress_loss_percent * Decimal("0.3")
-            + risk_metrics.concentration_risk * Decimal("0.1")
-        )
-        normalized_score = min(Decimal("100"), score * Decimal("200"))
-        return normalized_score
-
-    def _determine_risk_grade(self, overall_risk_score: Decimal) -> str:
-        """
-        Determines the risk grade based on the overall score.
-        """
-        if overall_risk_score < 20:
-            return "A (Very Low Risk)"
-        elif overall_risk_score < 40:
-            return "B (Low Risk)"
-        elif overall_risk_score < 60:
-            return "C (Moderate Risk)"
-        elif overall_risk_score < 80:
-            return "D (High Risk)"
-        else:
-            return "E (Very High Risk)"
-
-    async def _generate_risk_recommendations(
-        self, risk_metrics: RiskMetricsData, stress_test_results: List[Dict[str, Any]]
-    ) -> List[str]:
-        """
-        Generates actionable recommendations based on risk assessment.
-        """
-        recommendations = []
-        if risk_metrics.var_30d > Decimal("0.10"):
-            recommendations.append(
-                f"High 30-day VaR ({risk_metrics.var_30d:.2%}): Consider reducing exposure to volatile assets or increasing diversification."
-            )
-        if risk_metrics.concentration_risk > Decimal("0.5"):
-            recommendations.append(
-                f"High Concentration Risk (HHI: {risk_metrics.concentration_risk:.2f}): Your portfolio is heavily reliant on a few assets. Diversify across more uncorrelated assets."
-            )
-        max_loss_scenario = max(
-            stress_test_results, key=lambda x: x["potential_loss_percent"]
+            float(risk_metrics.var_30d + risk_metrics.expected_shortfall) / 2 * 0.6
+            + float(max_stress_loss) / 100 * 0.3
+            + float(risk_metrics.concentration_risk) * 0.1
         )
-        if max_loss_scenario["potential_loss_percent"] > 30:
-            recommendations.append(
-                f"Extreme Stress Test Loss ({max_loss_scenario['potential_loss_percent']:.2f}% in '{max_loss_scenario['scenario_name']}'): Your portfolio is highly vulnerable to a major market event. Implement hedging strategies."
-            )
-        if risk_metrics.sharpe_ratio < Decimal("0.5"):
-            recommendations.append(
-                f"Low Sharpe Ratio ({risk_metrics.sharpe_ratio:.2f}): The risk-adjusted return is low. Seek assets with higher expected returns for the level of risk taken."
-            )
-        if not recommendations:
-            recommendations.append(
-                "Portfolio risk profile is healthy. Continue to monitor market conditions."
-            )
-        return recommendations
-
-    async def _get_user_risk_profile(self, user_id: UUID) -> Optional[UserRiskProfile]:
-        """Fetches the user's risk profile. (Placeholder)"""
-        return None
-
-    async def _calculate_user_risk_score(
-        self, assessment_data: Dict[str, Any]
-    ) -> Decimal:
-        """Calculates user risk tolerance score based on questionnaire. (Placeholder)"""
-        return Decimal(str(assessment_data.get("risk_score", 50)))
-
-    def _determine_user_risk_level(self, risk_score: Decimal) -> RiskLevel:
-        """Determines user risk level. (Placeholder)"""
-        if risk_score < 30:
-            return RiskLevel.LOW
-        elif risk_score < 70:
-            return RiskLevel.MEDIUM
-        else:
-            return RiskLevel.HIGH
-
-    def _calculate_risk_based_limits(
-        self, risk_level: RiskLevel, assessment_data: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Calculates risk-based limits for the user. (Placeholder)"""
-        if risk_level == RiskLevel.LOW:
-            return {
-                "daily_transaction_limit": Decimal("10000"),
-                "monthly_transaction_limit": Decimal("50000"),
-                "max_portfolio_value": Decimal("100000"),
-                "max_single_asset_allocation": Decimal("0.25"),
-            }
-        elif risk_level == RiskLevel.MEDIUM:
-            return {
-                "daily_transaction_limit": Decimal("50000"),
-                "monthly_transaction_limit": Decimal("250000"),
-                "max_portfolio_value": Decimal("500000"),
-                "max_single_asset_allocation": Decimal("0.50"),
-            }
-        else:
-            return {
-                "daily_transaction_limit": Decimal("100000"),
-                "monthly_transaction_limit": Decimal("500000"),
-                "max_portfolio_value": Decimal("1000000"),
-                "max_single_asset_allocation": Decimal("0.75"),
-            }
-
-    async def _get_latest_risk_assessment(
-        self, portfolio_id: UUID
-    ) -> Optional[RiskAssessment]:
-        """Fetches the latest risk assessment. (Placeholder)"""
-        return None
-
-    async def _check_risk_thresholds(
-        self,
-        current_metrics: RiskMetricsData,
-        latest_assessment: Optional[RiskAssessment],
-    ) -> List[Dict[str, Any]]:
-        """Checks for breaches of predefined risk thresholds. (Placeholder)"""
-        alerts = []
-        if current_metrics.overall_risk_score > Decimal("70"):
-            alerts.append(
-                {
-                    "type": "CRITICAL",
-                    "metric": "Overall Risk Score",
-                    "value": float(current_metrics.overall_risk_score),
-                    "threshold": 70,
-                    "message": "Overall risk score is critically high. Immediate review required.",
-                }
-            )
-        return alerts
-
-    async def _check_concentration_limits(
-        self, portfolio: Portfolio
-    ) -> List[Dict[str, Any]]:
-        """Checks for breaches of concentration limits. (Placeholder)"""
-        return []
-
-    async def _check_correlation_changes(
-        self, portfolio: Portfolio, latest_assessment: Optional[RiskAssessment]
-    ) -> List[Dict[str, Any]]:
-        """Checks for significant changes in asset correlation. (Placeholder)"""
-        return []
-
-    async def _generate_monitoring_recommendations(
-        self, current_metrics: RiskMetricsData
-    ) -> List[str]:
-        """Generates recommendations for real-time monitoring. (Placeholder)"""
-        return ["Monitor the 1-day VaR closely for sudden market movements."]
+        return min(100.0, score * 200)
 
     async def assess_portfolio_risk(
         self, portfolio_id: UUID, user_id: UUID
@@ -513,17 +633,24 @@ class RiskService:
             portfolio = await self._get_portfolio_with_assets(portfolio_id, user_id)
             if not portfolio:
                 raise ValueError("Portfolio not found")
-            risk_metrics = await self._calculate_risk_metrics(portfolio)
-            stress_test_results = await self._perform_stress_tests(portfolio)
-            overall_risk_score = await self._calculate_overall_risk_score(
-                risk_metrics, stress_test_results
+            # Start the benchmark fetch behind beta before the gather, so the
+            # CPU-bound stress run executes while that request is in flight;
+            # beta then reads the result through the lookup cache.
+            benchmark = asyncio.ensure_future(self._get_market_returns())
+            risk_metrics, stress_tests = await asyncio.gather(
+                self._calculate_risk_metrics(portfolio),
+                self._perform_stress_tests(portfolio, include_detail=True),
+            )
+            await asyncio.gather(benchmark, return_exceptions=True)
+            overall_risk_score = self._calculate_overall_risk_score(
+                risk_metrics, stress_tests
             )
             risk_grade = self._determine_risk_grade(overall_risk_score)
             risk_assessment = RiskAssessment(
                 portfolio_id=portfolio_id,
                 user_id=user_id,
-                assessment_date=datetime.utcnow(),
-                risk_score=overall_risk_score,
+                assessment_date=risk_metrics.timestamp,
+                risk_score=Decimal(repr(overall_risk_score)),
                 risk_grade=risk_grade,
                 var_1d=risk_metrics.var_1d,
                 var_5d=risk_metrics.var_5d,
@@ -535,9 +662,9 @@ class RiskService:
                 volatility=risk_metrics.volatility,
                 concentration_risk=risk_metrics.concentration_risk,
                 liquidity_risk=risk_metrics.liquidity_risk,
-                stress_test_results=stress_test_results,
+                stress_test_results=stress_tests.results,
                 recommendations=await self._generate_risk_recommendations(
-                    risk_metrics, stress_test_results
+                    risk_metrics, stress_tests
                 ),
                 metadata={
                     "correlation_matrix": risk_metrics.correlation_matrix,
@@ -549,12 +676,13 @@ class RiskService:
                     },
                 },
             )
-            self.db.add(risk_assessment)
-            await self.db.commit()
+            await self._persist(risk_assessment)
+            self._remember_lookup(
+                ("latest_risk_assessment", portfolio_id), risk_assessment
+            )
             logger.info(f"Risk assessment completed for portfolio {portfolio_id}")
             return risk_assessment
         except Exception as e:
-            await self.db.rollback()
             logger.error(f"Error assessing portfolio risk: {e}")
             raise
 
@@ -565,35 +693,35 @@ class RiskService:
         Perform comprehensive user risk profiling
         """
         try:
+            risk_score = await self._calculate_user_risk_score(assessment_data)
+            risk_level = self._determine_user_risk_level(risk_score)
+            limits = self._calculate_risk_based_limits(risk_level, assessment_data)
             user_risk_profile = await self._get_user_risk_profile(user_id)
             if not user_risk_profile:
                 user_risk_profile = UserRiskProfile(user_id=user_id)
-                self.db.add(user_risk_profile)
-            risk_score = await self._calculate_user_risk_score(assessment_data)
-            risk_level = self._determine_user_risk_level(risk_score)
             user_risk_profile.risk_level = risk_level
-            user_risk_profile.risk_score = risk_score
+            user_risk_profile.risk_score = Decimal(repr(risk_score))
             user_risk_profile.assessment_date = datetime.utcnow()
             user_risk_profile.questionnaire_responses = assessment_data
-            limits = self._calculate_risk_based_limits(risk_level, assessment_data)
-            user_risk_profile.daily_transaction_limit = limits[
-                "daily_transaction_limit"
-            ]
-            user_risk_profile.monthly_transaction_limit = limits[
-                "monthly_transaction_limit"
-            ]
-            user_risk_profile.max_portfolio_value = limits["max_portfolio_value"]
-            user_risk_profile.max_single_asset_allocation = limits[
-                "max_single_asset_allocation"
-            ]
-            await self.db.commit()
+            for field, limit in limits.items():
+                setattr(user_risk_profile, field, Decimal(repr(limit)))
+            await self._persist(user_risk_profile)
+            self._remember_lookup(("user_risk_profile", user_id), user_risk_profile)
             logger.info(f"User risk assessment completed for user {user_id}")
             return user_risk_profile
         except Exception as e:
-            await self.db.rollback()
             logger.error(f"Error performing user risk assessment: {e}")
             raise
 
+    async def _persist(self, instance: Any) -> None:
+        """Add and commit, rolling back only when the write itself fails"""
+        self.db.add(instance)
+        try:
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+
     async def monitor_portfolio_risk(
         self, portfolio_id: UUID, user_id: UUID
     ) -> Dict[str, Any]:
@@ -605,7 +733,7 @@ class RiskService:
             if not portfolio:
                 raise ValueError("Portfolio not found")
             latest_assessment = await self._get_latest_risk_assessment(portfolio_id)
-            current_metrics = await self._calculate_risk_metrics(portfolio)
+            current_metrics = await self._get_cached_risk_metrics(portfolio)
             alerts = await self._check_risk_thresholds(
                 current_metrics, latest_assessment
             )
@@ -635,6 +763,42 @@ class RiskService:
             logger.error(f"Error monitoring portfolio risk: {e}")
             raise
 
+    async def perform_stress_test(
+        self, portfolio_id: UUID, user_id: UUID, scenario_name: str
+    ) -> Dict[str, Any]:
+        """
+        Run a single stress scenario with its per-asset breakdown
+        """
+        try:
+            portfolio = await self._get_portfolio_with_assets(portfolio_id, user_id)
+            if not portfolio:
+                raise ValueError("Portfolio not found")
+            row = next(
+                (
+                    index
+                    for index, scenario in enumerate(self.stress_scenarios)
+                    if scenario.name == scenario_name
+                ),
+                None,
+            )
+            if row is None:
+                raise ValueError(f"Unknown stress scenario: {scenario_name}")
+            context = self._stress_context(portfolio)
+            shocks = self._scenario_shocks(context.asset_types)[row]
+            total_loss = float(np.abs(shocks) @ context.values)
+            total_value = context.total_value
+            return self._run_stress_scenario(
+                context,
+                self.stress_scenarios[row],
+                shocks,
+                total_loss,
+                total_loss / total_value * 100 if total_value > 0 else 0.0,
+                include_detail=True,
+            )
+        except Exception as e:
+            logger.error(f"Error performing stress test: {e}")
+            raise
+
     async def calculate_var(
         self, portfolio_id: UUID, confidence_level: float = 0.95, time_horizon: int = 1
     ) -> Dict[str, Any]:
@@ -642,11 +806,13 @@ class RiskService:
         Calculate Value at Risk (VaR) using multiple methods
         """
         try:
+            if not 0 < confidence_level < 1:
+                raise ValueError("Confidence level must be between 0 and 1")
             portfolio = await self._get_portfolio_with_assets(portfolio_id, None)
             if not portfolio:
                 raise ValueError("Portfolio not found")
             returns_data = await self._get_portfolio_returns(portfolio, days=252)
-            if not returns_data:
+            if returns_data.size == 0:
                 raise ValueError("Insufficient historical data for VaR calculation")
             var_results = {
                 "portfolio_id": str(portfolio_id),
@@ -655,33 +821,35 @@ class RiskService:
                 "calculation_date": datetime.utcnow().isoformat(),
                 "methods": {},
             }
+            moments = self._return_moments(returns_data)
+            tail = self._tail_statistics(returns_data, confidence_level)
             historical_var = self._calculate_historical_var(
-                returns_data, confidence_level, time_horizon
+                returns_data, confidence_level, time_horizon, tail=tail
             )
             var_results["methods"]["historical_simulation"] = {
-                "var": float(historical_var),
+                "var": historical_var,
                 "description": "Based on historical return distribution",
             }
             parametric_var = self._calculate_parametric_var(
-                returns_data, confidence_level, time_horizon
+                returns_data, confidence_level, time_horizon, moments=moments
             )
             var_results["methods"]["parametric"] = {
-                "var": float(parametric_var),
+                "var": parametric_var,
                 "description": "Based on normal distribution assumption",
             }
             monte_carlo_var = await self._calculate_monte_carlo_var(
-                portfolio, returns_data, confidence_level, time_horizon
+                portfolio, returns_data, confidence_level, time_horizon, moments=moments
             )
             var_results["methods"]["monte_carlo"] = {
-                "var": float(monte_carlo_var),
-                "description": "Based on Monte Carlo simulation",
+                "var": monte_carlo_var,
+                "description": "Normal quantile that Monte Carlo sampling converges to",
             }
             expected_shortfall = self._calculate_expected_shortfall(
-                returns_data, confidence_level
+                returns_data, confidence_level, tail=tail
             )
-            var_results["expected_shortfall"] = float(expected_shortfall)
+            var_results["expected_shortfall"] = expected_shortfall
             recommended_var = (historical_var + parametric_var + monte_carlo_var) / 3
-            var_results["recommended_var"] = float(recommended_var)
+            var_results["recommended_var"] = recommended_var
             return var_results
         except Exception as e:
             logger.error(f"Error calculating VaR: {e}")
@@ -691,303 +859,580 @@ class RiskService:
         self, portfolio_id: UUID, user_id: Optional[UUID]
     ) -> Optional[Portfolio]:
         """Get portfolio with assets loaded"""
-        conditions = [Portfolio.id == portfolio_id, Portfolio.is_deleted == False]
+        params = {"portfolio_id": portfolio_id}
         if user_id:
-            conditions.append(Portfolio.user_id == user_id)
-        stmt = select(Portfolio).where(and_(*conditions))
-        result = await self.db.execute(stmt)
+            params["user_id"] = user_id
+        result = await self.db.execute(_portfolio_stmt(bool(user_id)), params)
         return result.scalar_one_or_none()
 
     async def _calculate_risk_metrics(self, portfolio: Portfolio) -> RiskMetricsData:
         """Calculate comprehensive risk metrics for portfolio"""
         try:
-            returns_data = await self._get_portfolio_returns(portfolio, days=252)
-            if not returns_data:
-                return RiskMetricsData(
-                    portfolio_id=portfolio.id,
-                    var_1d=Decimal("0.05"),
-                    var_5d=Decimal("0.10"),
-                    var_30d=Decimal("0.20"),
-                    expected_shortfall=Decimal("0.08"),
-                    sharpe_ratio=Decimal("0.0"),
-                    sortino_ratio=Decimal("0.0"),
-                    max_drawdown=Decimal("0.0"),
-                    beta=Decimal("1.0"),
-                    alpha=Decimal("0.0"),
-                    volatility=Decimal("0.15"),
-                    correlation_matrix={},
-                    concentration_risk=Decimal("0.0"),
-                    liquidity_risk=Decimal("0.0"),
-                    credit_risk=Decimal("0.0"),
-                    market_risk=Decimal("0.0"),
-                    operational_risk=Decimal("0.0"),
-                    overall_risk_score=Decimal("50.0"),
-                    risk_grade="Medium",
-                    timestamp=datetime.utcnow(),
-                )
-            returns_array = np.array(returns_data)
-            var_1d = self._calculate_historical_var(returns_data, 0.95, 1)
-            var_5d = self._calculate_historical_var(returns_data, 0.95, 5)
-            var_30d = self._calculate_historical_var(returns_data, 0.95, 30)
-            expected_shortfall = self._calculate_expected_shortfall(returns_data, 0.95)
-            sharpe_ratio = self._calculate_sharpe_ratio(returns_array)
-            sortino_ratio = self._calculate_sortino_ratio(returns_array)
-            max_drawdown = self._calculate_max_drawdown(returns_array)
-            beta, alpha = await self._calculate_beta_alpha(portfolio, returns_array)
-            volatility = Decimal(str(np.std(returns_array) * np.sqrt(252)))
-            concentration_risk = await self._calculate_concentration_risk(portfolio)
-            liquidity_risk = await self._calculate_liquidity_risk(portfolio)
-            credit_risk = await self._calculate_credit_risk(portfolio)
-            market_risk = var_1d
-            operational_risk = Decimal("0.02")
-            correlation_matrix = await self._calculate_correlation_matrix(portfolio)
-            overall_risk_score = await self._calculate_overall_risk_score_from_metrics(
-                var_1d, concentration_risk, liquidity_risk, volatility
+            returns_array = await self._get_portfolio_returns(portfolio, days=252)
+            if returns_array.size == 0:
+                return self._default_risk_metrics(portfolio)
+            var_threshold, tail_mean = self._tail_statistics(returns_array, 0.95)
+            var_1d = abs(var_threshold)
+            moments, downside_deviation, max_drawdown = self._return_profile(
+                returns_array
             )
-            risk_grade = self._determine_risk_grade(overall_risk_score)
-            return RiskMetricsData(
-                portfolio_id=portfolio.id,
+            return await self._assemble_risk_metrics(
+                portfolio,
+                returns_array,
                 var_1d=var_1d,
-                var_5d=var_5d,
-                var_30d=var_30d,
-                expected_shortfall=expected_shortfall,
-                sharpe_ratio=sharpe_ratio,
-                sortino_ratio=sortino_ratio,
+                var_5d=var_1d * np.sqrt(5),
+                var_30d=var_1d * np.sqrt(30),
+                expected_shortfall=abs(tail_mean),
+                sharpe_ratio=self._calculate_sharpe_ratio(
+                    returns_array, moments=moments
+                ),
+                sortino_ratio=self._calculate_sortino_ratio(
+                    returns_array,
+                    moments=moments,
+                    downside_deviation=downside_deviation,
+                ),
                 max_drawdown=max_drawdown,
-                beta=beta,
-                alpha=alpha,
-                volatility=volatility,
-                correlation_matrix=correlation_matrix,
-                concentration_risk=concentration_risk,
-                liquidity_risk=liquidity_risk,
-                credit_risk=credit_risk,
-                market_risk=market_risk,
-                operational_risk=operational_risk,
-                overall_risk_score=overall_risk_score,
-                risk_grade=risk_grade,
+                volatility=moments.std * np.sqrt(252),
                 timestamp=datetime.utcnow(),
+                moments=moments,
             )
         except Exception as e:
             logger.error(f"Error calculating risk metrics: {e}")
             raise
 
+    async def _calculate_risk_metrics_batch(
+        self, portfolios: List[Portfolio], risk_free_rate: float = 0.02
+    ) -> List[RiskMetricsData]:
+        """
+        Calculate risk metrics for many portfolios at once.
+        Return series are stacked into a (days, portfolios) matrix so VaR,
+        expected shortfall, Sharpe, Sortino, drawdown and volatility are each a
+        single column-wise NumPy reduction instead of one pass per portfolio.
+        """
+        now = datetime.utcnow()
+        try:
+            series = [
+                await self._get_portfolio_returns(portfolio, days=252)
+                for portfolio in portfolios
+            ]
+            batch = [i for i, returns in enumerate(series) if returns.size > 0]
+            results = [
+                self._default_risk_metrics(portfolio) for portfolio in portfolios
+            ]
+            if not batch:
+                return results
+            returns_matrix = np.column_stack([series[i] for i in batch])
+            k = max(int(0.05 * returns_matrix.shape[0]), 1)
+            partitioned = np.partition(returns_matrix, k - 1, axis=0)
+            var_1d = np.abs(partitioned[k - 1])
+            expected_shortfall = np.abs(partitioned[:k].mean(axis=0))
+            mean_returns = returns_matrix.mean(axis=0)
+            std_returns = returns_matrix.std(axis=0)
+            daily_risk_free = risk_free_rate / 252
+            with np.errstate(divide="ignore", invalid="ignore"):
+                sharpe = (mean_returns - daily_risk_free) / std_returns * np.sqrt(252)
+                downside = np.where(
+                    returns_matrix < daily_risk_free, returns_matrix, np.nan
+                )
+                downside_deviation = np.nanstd(downside, axis=0)
+                sortino = (
+                    (mean_returns - daily_risk_free) / downside_deviation * np.sqrt(252)
+                )
+            sharpe = np.nan_to_num(sharpe, nan=0.0, posinf=0.0, neginf=0.0)
+            sortino = np.nan_to_num(sortino, nan=0.0, posinf=0.0, neginf=0.0)
+            cumulative_returns = np.cumprod(1 + returns_matrix, axis=0)
+            running_max = np.maximum.accumulate(cumulative_returns, axis=0)
+            max_drawdown = np.abs(
+                ((cumulative_returns - running_max) / running_max).min(axis=0)
+            )
+            volatility = std_returns * np.sqrt(252)
+            for column, i in enumerate(batch):
+                results[i] = await self._assemble_risk_metrics(
+                    portfolios[i],
+                    series[i],
+                    var_1d=var_1d[column],
+                    var_5d=var_1d[column] * np.sqrt(5),
+                    var_30d=var_1d[column] * np.sqrt(30),
+                    expected_shortfall=expected_shortfall[column],
+                    sharpe_ratio=sharpe[column],
+                    sortino_ratio=sortino[column],
+                    max_drawdown=max_drawdown[column],
+                    volatility=volatility[column],
+                    timestamp=now,
+                    moments=ReturnMoments(
+                        mean=float(mean_returns[column]),
+                        std=float(std_returns[column]),
+                    ),
+                )
+            return results
+        except Exception as e:
+            logger.error(f"Error calculating batch risk metrics: {e}")
+            raise
+
+    async def _assemble_risk_metrics(
+        self,
+        portfolio: Portfolio,
+        returns: np.ndarray,
+        var_1d: float,
+        var_5d: float,
+        var_30d: float,
+        expected_shortfall: float,
+        sharpe_ratio: float,
+        sortino_ratio: float,
+        max_drawdown: float,
+        volatility: float,
+        timestamp: datetime,
+        moments: Optional[ReturnMoments] = None,
+    ) -> RiskMetricsData:
+        """
+        Combine return-based metrics with holdings-based metrics.
+        The independent lookups run concurrently, so the benchmark fetch
+        behind beta overlaps the holdings-based work. Everything is computed
+        in float64; Decimal is only built here, when the values leave the
+        service as RiskMetricsData.
+        """
+        (
+            (beta, alpha),
+            concentration_risk,
+            liquidity_risk,
+            credit_risk,
+            (symbols, correlation),
+        ) = await asyncio.gather(
+            self._calculate_beta_alpha(portfolio, returns, moments),
+            self._calculate_concentration_risk(portfolio),
+            self._calculate_liquidity_risk(portfolio),
+            self._calculate_credit_risk(portfolio),
+            self._calculate_correlation_matrix(portfolio),
+        )
+        overall_risk_score = await self._calculate_overall_risk_score_from_metrics(
+            float(var_1d),
+            concentration_risk,
+            liquidity_risk,
+            float(volatility),
+        )
+        risk_grade = self._determine_risk_grade(overall_risk_score)
+        return RiskMetricsData(
+            portfolio_id=portfolio.id,
+            var_1d=_to_decimal(var_1d),
+            var_5d=_to_decimal(var_5d),
+            var_30d=_to_decimal(var_30d),
+            expected_shortfall=_to_decimal(expected_shortfall),
+            sharpe_ratio=_to_decimal(sharpe_ratio),
+            sortino_ratio=_to_decimal(sortino_ratio),
+            max_drawdown=_to_decimal(max_drawdown),
+            beta=_to_decimal(beta),
+            alpha=_to_decimal(alpha),
+            volatility=_to_decimal(volatility),
+            correlation_symbols=symbols,
+            correlation_values=correlation,
+            concentration_risk=_to_decimal(concentration_risk),
+            liquidity_risk=_to_decimal(liquidity_risk),
+            credit_risk=_to_decimal(credit_risk),
+            market_risk=_to_decimal(var_1d),
+            operational_risk=Decimal("0.02"),
+            overall_risk_score=_to_decimal(overall_risk_score),
+            risk_grade=risk_grade,
+            timestamp=timestamp,
+        )
+
+    def _default_risk_metrics(self, portfolio: Portfolio) -> RiskMetricsData:
+        """Conservative metrics used when no return history is available"""
+        return RiskMetricsData(
+            portfolio_id=portfolio.id,
+            var_1d=Decimal("0.05"),
+            var_5d=Decimal("0.10"),
+            var_30d=Decimal("0.20"),
+            expected_shortfall=Decimal("0.08"),
+            sharpe_ratio=Decimal("0.0"),
+            sortino_ratio=Decimal("0.0"),
+            max_drawdown=Decimal("0.0"),
+            beta=Decimal("1.0"),
+            alpha=Decimal("0.0"),
+            volatility=Decimal("0.15"),
+            correlation_symbols=[],
+            correlation_values=np.empty((0, 0), dtype=np.float32),
+            concentration_risk=Decimal("0.0"),
+            liquidity_risk=Decimal("0.0"),
+            credit_risk=Decimal("0.0"),
+            market_risk=Decimal("0.0"),
+            operational_risk=Decimal("0.0"),
+            overall_risk_score=Decimal("50.0"),
+            risk_grade="Medium",
+            timestamp=datetime.utcnow(),
+        )
+
     async def _get_portfolio_returns(
         self, portfolio: Portfolio, days: int
-    ) -> List[float]:
-        """Get historical portfolio returns"""
+    ) -> np.ndarray:
+        """Get historical portfolio returns (read-only, shared per process)"""
         try:
-            np.random.seed(42)
-            returns = np.random.normal(0.0008, 0.02, days)
-            return returns.tolist()
+            return _synthetic_portfolio_returns(days)
         except Exception as e:
             logger.error(f"Error getting portfolio returns: {e}")
-            return []
+            return np.empty(0)
 
     def _calculate_historical_var(
-        self, returns: List[float], confidence_level: float, time_horizon: int
-    ) -> Decimal:
+        self,
+        returns: np.ndarray,
+        confidence_level: float,
+        time_horizon: int,
+        tail: Optional[Tuple[float, float]] = None,
+    ) -> float:
         """Calculate Historical Simulation VaR"""
-        if not returns:
-            return Decimal("0.05")
-        returns_array = np.array(returns)
-        scaled_returns = returns_array * np.sqrt(time_horizon)
-        percentile = (1 - confidence_level) * 100
-        var = np.percentile(scaled_returns, percentile)
-        return Decimal(str(abs(var)))
+        if len(returns) == 0:
+            return 0.05
+        var_threshold, _ = tail or self._tail_statistics(returns, confidence_level)
+        return float(abs(var_threshold * np.sqrt(time_horizon)))
 
     def _calculate_parametric_var(
-        self, returns: List[float], confidence_level: float, time_horizon: int
-    ) -> Decimal:
+        self,
+        returns: np.ndarray,
+        confidence_level: float,
+        time_horizon: int,
+        moments: Optional[ReturnMoments] = None,
+    ) -> float:
         """Calculate Parametric VaR assuming normal distribution"""
-        if not returns:
-            return Decimal("0.05")
-        returns_array = np.array(returns)
-        mean_return = np.mean(returns_array)
-        std_return = np.std(returns_array)
-        z_score = stats.norm.ppf(1 - confidence_level)
+        if len(returns) == 0:
+            return 0.05
+        moments = moments or self._return_moments(returns)
+        mean_return = moments.mean
+        std_return = moments.std
+        z_score = _normal_quantile(1 - confidence_level)
         scaled_mean = mean_return * time_horizon
         scaled_std = std_return * np.sqrt(time_horizon)
         var = -(scaled_mean + z_score * scaled_std)
-        return Decimal(str(max(0, var)))
+        return float(max(0.0, var))
 
     async def _calculate_monte_carlo_var(
         self,
         portfolio: Portfolio,
-        returns: List[float],
+        returns: np.ndarray,
         confidence_level: float,
         time_horizon: int,
-        simulations: int = 10000,
-    ) -> Decimal:
-        """Calculate Monte Carlo VaR"""
-        if not returns:
-            return Decimal("0.05")
-        returns_array = np.array(returns)
-        mean_return = np.mean(returns_array)
-        std_return = np.std(returns_array)
-        np.random.seed(42)
-        simulated_returns = np.random.normal(
-            mean_return * time_horizon, std_return * np.sqrt(time_horizon), simulations
-        )
-        percentile = (1 - confidence_level) * 100
-        var = np.percentile(simulated_returns, percentile)
-        return Decimal(str(abs(var)))
+        moments: Optional[ReturnMoments] = None,
+    ) -> float:
+        """
+        Calculate Monte Carlo VaR.
+        A simulation from the single normal fitted to the portfolio returns
+        converges to the normal quantile, so that limit is returned directly
+        instead of sampling paths.
+        """
+        if len(returns) == 0:
+            return 0.05
+        moments = moments or self._return_moments(returns)
+        mean_return = moments.mean * time_horizon
+        std_return = moments.std * np.sqrt(time_horizon)
+        var = mean_return + _normal_quantile(1 - confidence_level) * std_return
+        return float(abs(var))
 
     def _calculate_expected_shortfall(
-        self, returns: List[float], confidence_level: float
-    ) -> Decimal:
+        self,
+        returns: np.ndarray,
+        confidence_level: float,
+        tail: Optional[Tuple[float, float]] = None,
+    ) -> float:
         """Calculate Expected Shortfall (Conditional VaR)"""
-        if not returns:
-            return Decimal("0.08")
-        returns_array = np.array(returns)
-        percentile = (1 - confidence_level) * 100
-        var_threshold = np.percentile(returns_array, percentile)
-        tail_returns = returns_array[returns_array <= var_threshold]
-        expected_shortfall = (
-            np.mean(tail_returns) if len(tail_returns) > 0 else var_threshold
+        if len(returns) == 0:
+            return 0.08
+        _, expected_shortfall = tail or self._tail_statistics(returns, confidence_level)
+        return abs(expected_shortfall)
+
+    def _tail_statistics(
+        self, returns: np.ndarray, confidence_level: float
+    ) -> Tuple[float, float]:
+        """
+        Return the VaR quantile and the mean of the tail at or below it.
+        A single O(n) partition replaces the sort behind np.percentile and the
+        boolean-mask copy previously used for the tail.
+        """
+        k = min(max(int((1 - confidence_level) * len(returns)), 1), len(returns))
+        if HAS_NUMBA:
+            var, expected_shortfall = _tail_kernel(returns, k)
+            return float(var), float(expected_shortfall)
+        partitioned = np.partition(returns, k - 1)
+        return float(partitioned[k - 1]), float(partitioned[:k].mean())
+
+    def _return_profile(
+        self, returns: np.ndarray, risk_free_rate: float = 0.02
+    ) -> Tuple[ReturnMoments, Optional[float], float]:
+        """
+        Moments, downside deviation and max drawdown of a return series.
+        With numba these come from one fused pass; otherwise the downside
+        deviation is left to the Sortino helper.
+        """
+        if HAS_NUMBA:
+            mean, std, downside_std, max_drawdown = _return_kernel(
+                returns, risk_free_rate / 252
+            )
+            return (
+                ReturnMoments(mean=float(mean), std=float(std)),
+                float(downside_std),
+                float(max_drawdown),
+            )
+        return (
+            self._return_moments(returns),
+            None,
+            self._calculate_max_drawdown(returns),
         )
-        return Decimal(str(abs(expected_shortfall)))
+
+    def _return_moments(self, returns: np.ndarray) -> ReturnMoments:
+        """Mean and standard deviation, computed once and shared by the helpers"""
+        return ReturnMoments(mean=float(np.mean(returns)), std=float(np.std(returns)))
 
     def _calculate_sharpe_ratio(
-        self, returns: np.ndarray, risk_free_rate: float = 0.02
-    ) -> Decimal:
+        self,
+        returns: np.ndarray,
+        risk_free_rate: float = 0.02,
+        moments: Optional[ReturnMoments] = None,
+    ) -> float:
         """Calculate Sharpe ratio"""
         if len(returns) == 0:
-            return Decimal("0.0")
-        excess_returns = returns - risk_free_rate / 252
-        if np.std(excess_returns) == 0:
-            return Decimal("0.0")
-        sharpe = np.mean(excess_returns) / np.std(excess_returns) * np.sqrt(252)
-        return Decimal(str(sharpe))
+            return 0.0
+        moments = moments or self._return_moments(returns)
+        if moments.std == 0:
+            return 0.0
+        sharpe = (moments.mean - risk_free_rate / 252) / moments.std * np.sqrt(252)
+        return float(sharpe)
 
     def _calculate_sortino_ratio(
-        self, returns: np.ndarray, risk_free_rate: float = 0.02
-    ) -> Decimal:
+        self,
+        returns: np.ndarray,
+        risk_free_rate: float = 0.02,
+        moments: Optional[ReturnMoments] = None,
+        downside_deviation: Optional[float] = None,
+    ) -> float:
         """Calculate Sortino ratio"""
         if len(returns) == 0:
-            return Decimal("0.0")
-        excess_returns = returns - risk_free_rate / 252
-        downside_returns = excess_returns[excess_returns < 0]
-        if len(downside_returns) == 0:
-            return Decimal("0.0")
-        downside_deviation = np.std(downside_returns)
+            return 0.0
+        daily_risk_free = risk_free_rate / 252
+        if downside_deviation is None:
+            downside_returns = returns[returns < daily_risk_free]
+            if len(downside_returns) == 0:
+                return 0.0
+            downside_deviation = np.std(downside_returns)
         if downside_deviation == 0:
-            return Decimal("0.0")
-        sortino = np.mean(excess_returns) / downside_deviation * np.sqrt(252)
-        return Decimal(str(sortino))
+            return 0.0
+        moments = moments or self._return_moments(returns)
+        sortino = (moments.mean - daily_risk_free) / downside_deviation * np.sqrt(252)
+        return float(sortino)
 
-    def _calculate_max_drawdown(self, returns: np.ndarray) -> Decimal:
+    def _calculate_max_drawdown(self, returns: np.ndarray) -> float:
         """Calculate maximum drawdown"""
         if len(returns) == 0:
-            return Decimal("0.0")
-        cumulative_returns = np.cumprod(1 + returns)
-        running_max = np.maximum.accumulate(cumulative_returns)
-        drawdown = (cumulative_returns - running_max) / running_max
-        max_drawdown = np.min(drawdown)
-        return Decimal(str(abs(max_drawdown)))
+            return 0.0
+        if HAS_NUMBA:
+            return float(_return_kernel(returns, 0.0)[3])
+        cumulative = np.add(returns, 1.0)
+        np.cumprod(cumulative, out=cumulative)
+        running_max = np.maximum.accumulate(cumulative)
+        np.divide(cumulative, running_max, out=cumulative)
+        return float(1.0 - cumulative.min())
 
     async def _calculate_beta_alpha(
-        self, portfolio: Portfolio, returns: np.ndarray
-    ) -> Tuple[Decimal, Decimal]:
-        """Calculate portfolio beta and alpha relative to market"""
+        self,
+        portfolio: Portfolio,
+        returns: np.ndarray,
+        moments: Optional[ReturnMoments] = None,
+    ) -> Tuple[float, float]:
+        """
+        Calculate portfolio beta and alpha relative to market.
+        Covariance and variance come from raw dot products minus the mean
+        products, so neither series is centered into a copy.
+        """
         try:
-            market_data = await self.market_data_service.get_historical_data(
-                "BTC", datetime.utcnow() - timedelta(days=252), datetime.utcnow()
+            market_returns = await self._get_market_returns()
+            if market_returns is None or len(market_returns) < len(returns):
+                return (1.0, 0.0)
+            n = len(returns)
+            portfolio_returns = np.asarray(returns, dtype=np.float64)
+            market_returns = market_returns[-n:]
+            portfolio_mean = (
+                moments.mean if moments is not None else portfolio_returns.mean()
             )
-            if not market_data or len(market_data) < len(returns):
-                return (Decimal("1.0"), Decimal("0.0"))
-            market_returns = []
-            for i in range(1, len(market_data)):
-                if market_data[i - 1].close_price != 0:
-                    ret = (
-                        market_data[i].close_price - market_data[i - 1].close_price
-                    ) / market_data[i - 1].close_price
-                    market_returns.append(float(ret))
-            if len(market_returns) < len(returns):
-                return (Decimal("1.0"), Decimal("0.0"))
-            min_length = min(len(returns), len(market_returns))
-            portfolio_returns = returns[-min_length:]
-            market_returns = market_returns[-min_length:]
-            covariance = np.cov(portfolio_returns, market_returns)[0, 1]
-            market_variance = np.var(market_returns)
+            market_mean = market_returns.mean()
+            market_variance = market_returns @ market_returns - n * market_mean**2
             if market_variance == 0:
-                beta = Decimal("1.0")
+                beta = 1.0
             else:
-                beta = Decimal(str(covariance / market_variance))
-            portfolio_mean = np.mean(portfolio_returns) * 252
-            market_mean = np.mean(market_returns) * 252
-            alpha = Decimal(str(portfolio_mean - float(beta) * market_mean))
-            return (beta, alpha)
+                covariance = (
+                    portfolio_returns @ market_returns
+                    - n * portfolio_mean * market_mean
+                )
+                beta = covariance / market_variance
+            alpha = (portfolio_mean - beta * market_mean) * 252
+            return (float(beta), float(alpha))
         except Exception as e:
             logger.error(f"Error calculating beta/alpha: {e}")
-            return (Decimal("1.0"), Decimal("0.0"))
+            return (1.0, 0.0)
+
+    async def _get_market_returns(self) -> Optional[np.ndarray]:
+        """Benchmark daily returns, shared by every beta in the lookup TTL"""
+        now = datetime.utcnow()
+
+        async def load() -> Optional[np.ndarray]:
+            market_data = await self.market_data_service.get_historical_data(
+                "BTC", now - timedelta(days=252), now
+            )
+            if not market_data:
+                return None
+            prices = np.fromiter(
+                (float(md.close_price) for md in market_data),
+                dtype=np.float64,
+                count=len(market_data),
+            )
+            with np.errstate(divide="ignore", invalid="ignore"):
+                market_returns = np.diff(prices) / prices[:-1]
+            market_returns = market_returns[np.isfinite(market_returns)]
+            market_returns.flags.writeable = False
+            return market_returns
 
-    async def _calculate_concentration_risk(self, portfolio: Portfolio) -> Decimal:
+        return await self._cached_lookup(("market_returns", ("BTC", now.date())), load)
+
+    async def _calculate_concentration_risk(self, portfolio: Portfolio) -> float:
         """Calculate portfolio concentration risk"""
-        if not portfolio.assets:
-            return Decimal("0.0")
-        total_value = portfolio.total_value or Decimal("0.0")
-        if total_value == 0:
-            return Decimal("0.0")
-        hhi = Decimal("0.0")
-        for asset in portfolio.assets:
-            if asset.current_value and total_value > 0:
-                weight = asset.current_value / total_value
-                hhi += weight**2
-        concentration_risk = hhi * 100
-        return min(concentration_risk, Decimal("100.0"))
-
-    async def _calculate_liquidity_risk(self, portfolio: Portfolio) -> Decimal:
+        arrays = self._asset_arrays(portfolio)
+        if not arrays.symbols or arrays.total_value <= 0:
+            return 0.0
+        hhi = float(arrays.weights @ arrays.weights)
+        return min(hhi * 100, 100.0)
+
+    async def _calculate_liquidity_risk(self, portfolio: Portfolio) -> float:
         """Calculate portfolio liquidity risk"""
-        if not portfolio.assets:
-            return Decimal("0.0")
-        total_value = portfolio.total_value or Decimal("0.0")
-        if total_value == 0:
-            return Decimal("0.0")
-        liquidity_scores = {
-            "cryptocurrency": 0.8,
-            "stock": 0.9,
-            "bond": 0.7,
-            "commodity": 0.6,
-            "real_estate": 0.2,
-            "private_equity": 0.1,
-        }
-        weighted_liquidity = Decimal("0.0")
-        for asset in portfolio.assets:
-            if asset.current_value and total_value > 0:
-                weight = asset.current_value / total_value
-                liquidity_score = liquidity_scores.get(asset.asset_type, 0.5)
-                weighted_liquidity += weight * Decimal(str(liquidity_score))
-        liquidity_risk = (Decimal("1.0") - weighted_liquidity) * 100
-        return max(Decimal("0.0"), min(liquidity_risk, Decimal("100.0")))
-
-    async def _calculate_credit_risk(self, portfolio: Portfolio) -> Decimal:
+        arrays = self._asset_arrays(portfolio)
+        if not arrays.symbols or arrays.total_value <= 0:
+            return 0.0
+        scores = _liquidity_vector(arrays.asset_types)
+        liquidity_risk = (1.0 - float(arrays.weights @ scores)) * 100
+        return max(0.0, min(liquidity_risk, 100.0))
+
+    def _asset_arrays(self, portfolio: Portfolio) -> PortfolioArrays:
+        """
+        Symbols, asset types, float64 current values and portfolio weights of
+        portfolio.assets, decoded in a single pass over the ORM objects.
+        Decoded once per portfolio revision (updated_at plus total_value, which
+        moves with asset revaluations); portfolios without an updated_at are
+        decoded on every call since there is nothing to invalidate on.
+        """
+        revision = (portfolio.updated_at, portfolio.total_value)
+        cached = self._asset_arrays_cache.get(portfolio.id)
+        if revision[0] is not None and cached is not None and cached[0] == revision:
+            return cached[1]
+        rows = [
+            (asset.symbol, asset.asset_type, float(asset.current_value or 0))
+            for asset in portfolio.assets
+        ]
+        symbols, asset_types, values = zip(*rows) if rows else ((), (), ())
+        values = np.array(values, dtype=np.float64)
+        total_value = float(portfolio.total_value or 0)
+        arrays = PortfolioArrays(
+            symbols=symbols,
+            asset_types=asset_types,
+            values=values,
+            total_value=total_value,
+            weights=values / total_value if total_value > 0 else np.zeros_like(values),
+        )
+        if revision[0] is not None:
+            self._asset_arrays_cache[portfolio.id] = (revision, arrays)
+        return arrays
+
+    async def _calculate_credit_risk(self, portfolio: Portfolio) -> float:
         """Calculate portfolio credit risk"""
-        return Decimal("5.0")
+        return 5.0
 
     async def _calculate_correlation_matrix(
         self, portfolio: Portfolio
-    ) -> Dict[str, Dict[str, float]]:
-        """Calculate correlation matrix for portfolio assets"""
-        if not portfolio.assets or len(portfolio.assets) < 2:
-            return {}
-        symbols = [asset.symbol for asset in portfolio.assets if asset.symbol]
-        correlation_matrix = {}
-        for symbol1 in symbols:
-            correlation_matrix[symbol1] = {}
-            for symbol2 in symbols:
-                if symbol1 == symbol2:
-                    correlation_matrix[symbol1][symbol2] = 1.0
-                else:
-                    correlation_matrix[symbol1][symbol2] = 0.6
-        return correlation_matrix
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        Calculate the dense correlation matrix for portfolio assets, kept as
+        float32 since it is stored and serialized far more than computed on.
+        The read-only result is kept in a process-wide LRU under the same key
+        as its spectrum, so repeated scoring of a portfolio skips the
+        reconstruction.
+        """
+        symbols = [symbol for symbol in self._asset_arrays(portfolio).symbols if symbol]
+        if not symbols:
+            return [], np.empty((0, 0), dtype=np.float32)
+        if len(symbols) == 1:
+            return symbols, np.ones((1, 1), dtype=np.float32)
+        key = (portfolio.id, tuple(symbols), datetime.utcnow().date())
+        cached = self._correlation_cache.get(key)
+        if cached is not None:
+            self._correlation_cache.move_to_end(key)
+            return symbols, cached
+        eigenvalues, eigenvectors = await self._get_correlation_spectrum(
+            portfolio, symbols
+        )
+        correlation = (eigenvectors * eigenvalues) @ eigenvectors.T
+        scale = 1.0 / np.sqrt(np.diag(correlation))
+        correlation *= scale
+        correlation *= scale[:, None]
+        np.fill_diagonal(correlation, 1.0)
+        correlation = correlation.astype(np.float32)
+        correlation.flags.writeable = False
+        self._correlation_cache[key] = correlation
+        if len(self._correlation_cache) > self.CORRELATION_CACHE_SIZE:
+            self._correlation_cache.popitem(last=False)
+        return symbols, correlation
+
+    async def _get_correlation_spectrum(
+        self, portfolio: Portfolio, symbols: List[str], days: int = 252
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Eigen-decomposition of the denoised asset correlation matrix.
+        Eigenvalues inside the Marchenko-Pastur noise band are replaced by their
+        mean, which preserves the trace while removing sampling noise. The
+        spectrum is kept read-only in a process-wide LRU per portfolio
+        composition and day, so later requests reuse it without another eigh.
+        """
+        key = (portfolio.id, tuple(symbols), datetime.utcnow().date())
+        cached = self._spectrum_cache.get(key)
+        if cached is not None:
+            self._spectrum_cache.move_to_end(key)
+            return cached
+        returns_matrix = await self._get_asset_returns(symbols, days=days)
+        # Post-hoc covariance from the Gram matrix: one gemm over the raw
+        # returns instead of np.corrcoef's centered copy of the whole matrix.
+        mean = returns_matrix.mean(axis=0)
+        correlation = returns_matrix.T @ returns_matrix
+        correlation /= days
+        correlation -= np.outer(mean, mean)
+        scale = 1.0 / np.sqrt(np.diag(correlation))
+        correlation *= scale
+        correlation *= scale[:, None]
+        eigenvalues, eigenvectors = np.linalg.eigh(correlation)
+        lambda_plus = (1 + np.sqrt(len(symbols) / days)) ** 2
+        noise = eigenvalues < lambda_plus
+        if noise.any():
+            eigenvalues[noise] = eigenvalues[noise].mean()
+        eigenvalues.flags.writeable = False
+        eigenvectors.flags.writeable = False
+        self._spectrum_cache[key] = (eigenvalues, eigenvectors)
+        if len(self._spectrum_cache) > self.SPECTRUM_CACHE_SIZE:
+            self._spectrum_cache.popitem(last=False)
+        return eigenvalues, eigenvectors
+
+    async def _get_asset_returns(self, symbols: List[str], days: int) -> np.ndarray:
+        """
+        Get historical per-asset returns as a (days, len(symbols)) matrix.
+        The matrix is freshly allocated and scaled in place.
+        """
+        rng = np.random.default_rng(42)
+        market_factor = rng.standard_normal((days, 1))
+        returns = rng.standard_normal((days, len(symbols)))
+        returns *= np.sqrt(0.4)
+        market_factor *= np.sqrt(0.6)
+        returns += market_factor
+        returns *= 0.02
+        returns += 0.0008
+        return returns
 
     async def _calculate_overall_risk_score_from_metrics(
         self,
-        var_1d: Decimal,
-        concentration_risk: Decimal,
-        liquidity_risk: Decimal,
-        volatility: Decimal,
-    ) -> Decimal:
+        var_1d: float,
+        concentration_risk: float,
+        liquidity_risk: float,
+        volatility: float,
+    ) -> float:
         """Calculate overall risk score from individual metrics"""
         weights = {
             "var": 0.4,
@@ -995,229 +1440,342 @@ class RiskService:
             "liquidity": 0.2,
             "volatility": 0.2,
         }
-        var_score = min(float(var_1d) * 1000, 100)
-        concentration_score = float(concentration_risk)
-        liquidity_score = float(liquidity_risk)
-        volatility_score = min(float(volatility) * 100, 100)
         overall_score = (
-            weights["var"] * var_score
-            + weights["concentration"] * concentration_score
-            + weights["liquidity"] * liquidity_score
-            + weights["volatility"] * volatility_score
+            weights["var"] * min(var_1d * 1000, 100)
+            + weights["concentration"] * concentration_risk
+            + weights["liquidity"] * liquidity_risk
+            + weights["volatility"] * min(volatility * 100, 100)
         )
-        return Decimal(str(max(0, min(100, overall_score))))
+        return max(0.0, min(100.0, overall_score))
 
-    def _determine_risk_grade(self, risk_score: Decimal) -> str:
+    def _determine_risk_grade(self, risk_score: float) -> str:
         """Determine risk grade from risk score"""
-        score = float(risk_score)
-        if score <= 20:
-            return "Very Low"
-        elif score <= 40:
-            return "Low"
-        elif score <= 60:
-            return "Medium"
-        elif score <= 80:
-            return "High"
-        else:
-            return "Very High"
+        return _GRADES[bisect.bisect_left(_GRADE_THRESHOLDS, float(risk_score))]
 
-    async def _perform_stress_tests(self, portfolio: Portfolio) -> List[Dict[str, Any]]:
-        """Perform stress tests on portfolio"""
+    async def _perform_stress_tests(
+        self, portfolio: Portfolio, include_detail: bool = False
+    ) -> StressTestBatch:
+        """
+        Perform stress tests on portfolio. Per-asset impacts are only built
+        when include_detail is set; callers that just rank scenario losses
+        skip the per-asset dicts entirely.
+        """
+        context = self._stress_context(portfolio)
+        shocks = self._scenario_shocks(context.asset_types)
+        losses = np.abs(shocks) @ context.values
+        if context.total_value > 0:
+            loss_percentages = losses / context.total_value * 100
+        else:
+            loss_percentages = np.zeros_like(losses)
         stress_results = []
-        for scenario in self.stress_scenarios:
+        for index, (scenario, total_loss, loss_percentage) in enumerate(
+            zip(self.stress_scenarios, losses.tolist(), loss_percentages.tolist())
+        ):
             try:
-                result = await self._run_stress_scenario(portfolio, scenario)
-                stress_results.append(result)
+                result = self._run_stress_scenario(
+                    context,
+                    scenario,
+                    shocks[index],
+                    total_loss,
+                    loss_percentage,
+                    include_detail,
+                )
             except Exception as e:
                 logger.error(f"Error running stress scenario {scenario.name}: {e}")
-                stress_results.append(
-                    {
-                        "scenario_name": scenario.name,
-                        "status": "failed",
-                        "error": str(e),
-                    }
-                )
-        return stress_results
+                result = {
+                    "scenario_name": scenario.name,
+                    "status": "failed",
+                    "error": str(e),
+                }
+                loss_percentages[index] = np.nan
+            stress_results.append(result)
+        return StressTestBatch(
+            scenario_names=[scenario.name for scenario in self.stress_scenarios],
+            losses=losses,
+            loss_percentages=loss_percentages,
+            results=stress_results,
+        )
+
+    async def _perform_stress_tests_batch(
+        self, portfolios: List[Portfolio]
+    ) -> np.ndarray:
+        """
+        Total stress loss for many portfolios at once, as a (portfolios,
+        scenarios) matrix aligned with self.stress_scenarios. Holdings are
+        packed CSR-style (flat values plus per-portfolio offsets) and the
+        reduction runs off the event loop on the dedicated stress worker.
+        """
+        default_column = self._scenario_matrix.shape[1] - 1
+        arrays = [self._asset_arrays(portfolio) for portfolio in portfolios]
+        values = np.concatenate([np.empty(0)] + [a.values for a in arrays])
+        columns = np.fromiter(
+            (
+                self._shock_columns.get(asset_type, default_column)
+                for a in arrays
+                for asset_type in a.asset_types
+            ),
+            dtype=np.intp,
+            count=values.size,
+        )
+        offsets = np.zeros(len(portfolios) + 1, dtype=np.intp)
+        np.cumsum([a.values.size for a in arrays], out=offsets[1:])
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._stress_executor, self._batch_stress_losses, values, columns, offsets
+        )
+
+    def _batch_stress_losses(
+        self, values: np.ndarray, columns: np.ndarray, offsets: np.ndarray
+    ) -> np.ndarray:
+        """(portfolios, scenarios) loss totals for CSR-packed holdings"""
+        if HAS_NUMBA:
+            losses = np.empty((offsets.size - 1, self._scenario_matrix.shape[0]))
+            _batch_stress_kernel(
+                values, columns, offsets, self._scenario_matrix, losses
+            )
+            return losses
+        asset_losses = np.abs(self._scenario_matrix)[:, columns] * values
+        cumulative = np.zeros((asset_losses.shape[0], values.size + 1))
+        np.cumsum(asset_losses, axis=1, out=cumulative[:, 1:])
+        return (cumulative[:, offsets[1:]] - cumulative[:, offsets[:-1]]).T
+
+    def _stress_context(self, portfolio: Portfolio) -> StressTestContext:
+        """Asset arrays shared by every stress scenario of a portfolio"""
+        arrays = self._asset_arrays(portfolio)
+        return StressTestContext(
+            symbols=list(arrays.symbols),
+            asset_types=arrays.asset_types,
+            values=arrays.values,
+            total_value=arrays.total_value,
+        )
+
+    def _scenario_shocks(self, asset_types: Tuple[str, ...]) -> np.ndarray:
+        """
+        (scenarios, assets) shock matrix for a portfolio's asset type layout.
+        Kept in a small LRU since compositions repeat across assessments.
+        """
+        shocks = self._shock_cache.get(asset_types)
+        if shocks is not None:
+            self._shock_cache.move_to_end(asset_types)
+            return shocks
+        default_column = self._scenario_matrix.shape[1] - 1
+        columns = np.fromiter(
+            (
+                self._shock_columns.get(asset_type, default_column)
+                for asset_type in asset_types
+            ),
+            dtype=np.intp,
+            count=len(asset_types),
+        )
+        shocks = self._scenario_matrix[:, columns]
+        self._shock_cache[asset_types] = shocks
+        if len(self._shock_cache) > self.SHOCK_CACHE_SIZE:
+            self._shock_cache.popitem(last=False)
+        return shocks
 
-    async def _run_stress_scenario(
-        self, portfolio: Portfolio, scenario: StressTestScenario
+    def _run_stress_scenario(
+        self,
+        context: StressTestContext,
+        scenario: StressTestScenario,
+        shocks: np.ndarray,
+        total_loss: float,
+        loss_percentage: float,
+        include_detail: bool = False,
     ) -> Dict[str, Any]:
-        """Run a specific stress test scenario"""
-        if not portfolio.assets:
+        """Build the result of a stress scenario from its precomputed loss"""
+        if not context.symbols:
             return {
                 "scenario_name": scenario.name,
                 "portfolio_loss": 0.0,
-                "asset_impacts": {},
+                "asset_impacts": self._stress_asset_impacts(context, shocks),
                 "status": "completed",
             }
-        total_value = float(portfolio.total_value or Decimal("0.0"))
-        total_loss = 0.0
-        asset_impacts = {}
-        for asset in portfolio.assets:
-            asset_value = float(asset.current_value or Decimal("0.0"))
-            shock = 0.0
-            if asset.asset_type in scenario.market_shocks:
-                shock = scenario.market_shocks[asset.asset_type]
-            elif "all" in scenario.market_shocks:
-                shock = scenario.market_shocks["all"]
-            asset_loss = asset_value * abs(shock)
-            total_loss += asset_loss
-            asset_impacts[asset.symbol] = {
-                "current_value": asset_value,
-                "shock_percentage": shock * 100,
-                "loss_amount": asset_loss,
-                "stressed_value": asset_value - asset_loss,
-            }
-        loss_percentage = total_loss / total_value * 100 if total_value > 0 else 0.0
-        return {
+        result = {
             "scenario_name": scenario.name,
             "scenario_description": scenario.description,
             "portfolio_loss": total_loss,
             "loss_percentage": loss_percentage,
-            "stressed_portfolio_value": total_value - total_loss,
-            "asset_impacts": asset_impacts,
+            "stressed_portfolio_value": context.total_value - total_loss,
             "duration_days": scenario.duration_days,
             "status": "completed",
         }
+        if include_detail:
+            result["asset_impacts"] = self._stress_asset_impacts(context, shocks)
+        return result
+
+    def _stress_asset_impacts(
+        self, context: StressTestContext, shocks: np.ndarray
+    ) -> Dict[str, List[Any]]:
+        """
+        Per-asset loss breakdown of a stress scenario, laid out by column
+        (parallel lists aligned with "symbols") so it serializes without a
+        dict per asset.
+        """
+        values = context.values
+        if not shocks.any():
+            asset_losses = np.zeros_like(values)
+            stressed_values = values
+        elif HAS_NUMBA:
+            asset_losses = np.empty_like(values)
+            stressed_values = np.empty_like(values)
+            _stress_kernel(values, shocks, asset_losses, stressed_values)
+        else:
+            asset_losses = values * np.abs(shocks)
+            stressed_values = values - asset_losses
+        return {
+            "symbols": context.symbols,
+            "current_value": values.tolist(),
+            "shock_percentage": (shocks * 100).tolist(),
+            "loss_amount": asset_losses.tolist(),
+            "stressed_value": stressed_values.tolist(),
+        }
 
     async def _generate_risk_recommendations(
-        self, risk_metrics: RiskMetricsData, stress_results: List[Dict[str, Any]]
+        self, risk_metrics: RiskMetricsData, stress_tests: StressTestBatch
     ) -> List[str]:
         """Generate risk management recommendations"""
-        recommendations = []
-        if risk_metrics.var_1d > Decimal("0.10"):
-            recommendations.append(
-                "Consider reducing position sizes to lower daily Value at Risk"
-            )
-        if risk_metrics.concentration_risk > Decimal("50.0"):
-            recommendations.append(
-                "Portfolio is highly concentrated - consider diversifying across more assets"
-            )
-        if risk_metrics.liquidity_risk > Decimal("30.0"):
-            recommendations.append(
-                "Consider increasing allocation to more liquid assets"
-            )
-        if risk_metrics.volatility > Decimal("0.30"):
-            recommendations.append(
-                "Portfolio volatility is high - consider adding stable assets or hedging"
-            )
-        for result in stress_results:
-            if result.get("loss_percentage", 0) > 50:
-                recommendations.append(
-                    f"Portfolio vulnerable to {result['scenario_name']} - consider hedging strategies"
-                )
-        if risk_metrics.sharpe_ratio < Decimal("0.5"):
+        recommendations = [
+            message
+            for metric, threshold, message in _RECOMMENDATION_CEILINGS
+            if float(getattr(risk_metrics, metric)) > threshold
+        ]
+        for index in np.flatnonzero(stress_tests.loss_percentages > 50).tolist():
             recommendations.append(
-                "Risk-adjusted returns are low - review asset selection and allocation"
+                f"Portfolio vulnerable to {stress_tests.scenario_names[index]} - consider hedging strategies"
             )
+        recommendations.extend(
+            message
+            for metric, threshold, message in _RECOMMENDATION_FLOORS
+            if float(getattr(risk_metrics, metric)) < threshold
+        )
         return recommendations
 
     async def _get_user_risk_profile(self, user_id: UUID) -> Optional[UserRiskProfile]:
         """Get user risk profile"""
-        stmt = select(UserRiskProfile).where(UserRiskProfile.user_id == user_id)
-        result = await self.db.execute(stmt)
-        return result.scalar_one_or_none()
+
+        async def load() -> Optional[UserRiskProfile]:
+            stmt = select(UserRiskProfile).where(UserRiskProfile.user_id == user_id)
+            result = await self.db.execute(stmt)
+            return result.scalar_one_or_none()
+
+        return await self._cached_lookup(("user_risk_profile", user_id), load)
 
     async def _calculate_user_risk_score(
         self, assessment_data: Dict[str, Any]
-    ) -> Decimal:
+    ) -> float:
         """Calculate user risk tolerance score from questionnaire"""
         age = assessment_data.get("age", 35)
         income = assessment_data.get("annual_income", 50000)
         investment_experience = assessment_data.get("investment_experience", "moderate")
         risk_tolerance = assessment_data.get("risk_tolerance", "moderate")
         investment_horizon = assessment_data.get("investment_horizon", "medium")
-        score = 50
-        if age < 30:
-            score += 15
-        elif age < 50:
-            score += 5
-        else:
-            score -= 10
-        if income > 100000:
-            score += 10
-        elif income < 30000:
-            score -= 10
-        experience_scores = {
-            "beginner": -15,
-            "moderate": 0,
-            "experienced": 15,
-            "expert": 25,
-        }
-        score += experience_scores.get(investment_experience, 0)
-        tolerance_scores = {
-            "conservative": -20,
-            "moderate": 0,
-            "aggressive": 20,
-            "very_aggressive": 30,
-        }
-        score += tolerance_scores.get(risk_tolerance, 0)
-        horizon_scores = {"short": -10, "medium": 0, "long": 10, "very_long": 15}
-        score += horizon_scores.get(investment_horizon, 0)
-        return Decimal(str(max(0, min(100, score))))
+        score = (
+            50
+            + _AGE_SCORES[(age >= 30) + (age >= 50)]
+            + _INCOME_SCORES[(income >= 30000) + (income > 100000)]
+            + _EXPERIENCE_SCORES.get(investment_experience, 0)
+            + _TOLERANCE_SCORES.get(risk_tolerance, 0)
+            + _HORIZON_SCORES.get(investment_horizon, 0)
+        )
+        return float(max(0, min(100, score)))
 
-    def _determine_user_risk_level(self, risk_score: Decimal) -> RiskLevel:
+    def _determine_user_risk_level(self, risk_score: float) -> RiskLevel:
         """Determine user risk level from score"""
-        score = float(risk_score)
-        if score <= 25:
-            return RiskLevel.LOW
-        elif score <= 50:
-            return RiskLevel.MEDIUM
-        elif score <= 75:
-            return RiskLevel.HIGH
-        else:
-            return RiskLevel.CRITICAL
+        return _USER_RISK_LEVELS[
+            bisect.bisect_left(_USER_RISK_THRESHOLDS, float(risk_score))
+        ]
 
     def _calculate_risk_based_limits(
         self, risk_level: RiskLevel, assessment_data: Dict[str, Any]
-    ) -> Dict[str, Decimal]:
+    ) -> Dict[str, float]:
         """Calculate risk-based transaction and portfolio limits"""
-        base_limits = {
-            RiskLevel.LOW: {
-                "daily_transaction_limit": Decimal("1000"),
-                "monthly_transaction_limit": Decimal("10000"),
-                "max_portfolio_value": Decimal("50000"),
-                "max_single_asset_allocation": Decimal("0.20"),
-            },
-            RiskLevel.MEDIUM: {
-                "daily_transaction_limit": Decimal("5000"),
-                "monthly_transaction_limit": Decimal("50000"),
-                "max_portfolio_value": Decimal("250000"),
-                "max_single_asset_allocation": Decimal("0.30"),
-            },
-            RiskLevel.HIGH: {
-                "daily_transaction_limit": Decimal("25000"),
-                "monthly_transaction_limit": Decimal("250000"),
-                "max_portfolio_value": Decimal("1000000"),
-                "max_single_asset_allocation": Decimal("0.50"),
-            },
-            RiskLevel.CRITICAL: {
-                "daily_transaction_limit": Decimal("100000"),
-                "monthly_transaction_limit": Decimal("1000000"),
-                "max_portfolio_value": Decimal("10000000"),
-                "max_single_asset_allocation": Decimal("0.70"),
-            },
-        }
-        limits = base_limits.get(risk_level, base_limits[RiskLevel.MEDIUM])
+        limits = dict(_BASE_LIMITS.get(risk_level, _BASE_LIMITS[RiskLevel.MEDIUM]))
         income = assessment_data.get("annual_income", 50000)
         income_multiplier = min(max(income / 50000, 0.5), 5.0)
-        limits["daily_transaction_limit"] *= Decimal(str(income_multiplier))
-        limits["monthly_transaction_limit"] *= Decimal(str(income_multiplier))
-        limits["max_portfolio_value"] *= Decimal(str(income_multiplier))
+        limits["daily_transaction_limit"] *= income_multiplier
+        limits["monthly_transaction_limit"] *= income_multiplier
+        limits["max_portfolio_value"] *= income_multiplier
         return limits
 
     async def _get_latest_risk_assessment(
         self, portfolio_id: UUID
     ) -> Optional[RiskAssessment]:
         """Get latest risk assessment for portfolio"""
-        stmt = (
-            select(RiskAssessment)
-            .where(RiskAssessment.portfolio_id == portfolio_id)
-            .order_by(RiskAssessment.assessment_date.desc())
-            .limit(1)
+
+        async def load() -> Optional[RiskAssessment]:
+            result = await self.db.execute(
+                _latest_assessment_stmt(), {"portfolio_id": portfolio_id}
+            )
+            return result.scalar_one_or_none()
+
+        return await self._cached_lookup(("latest_risk_assessment", portfolio_id), load)
+
+    async def _get_cached_risk_metrics(self, portfolio: Portfolio) -> RiskMetricsData:
+        """
+        Risk metrics for monitoring polls, shared by every service in the
+        process for the lookup TTL. The key includes the holdings, so any
+        position or price change recomputes. Concurrent misses on the same key
+        wait on one calculation; its lock is dropped once nobody holds it.
+        """
+        arrays = self._asset_arrays(portfolio)
+        key = (portfolio.id, arrays.symbols, arrays.values.tobytes())
+        cached = self._fresh_metrics(key)
+        if cached is not None:
+            return cached
+        lock = self._metrics_locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                cached = self._fresh_metrics(key)
+                if cached is not None:
+                    return cached
+                metrics = await self._calculate_risk_metrics(portfolio)
+                with self._metrics_cache_lock:
+                    self._metrics_cache[key] = (
+                        time.monotonic() + self.LOOKUP_CACHE_TTL_SECONDS,
+                        metrics,
+                    )
+                    self._metrics_cache.move_to_end(key)
+                    if len(self._metrics_cache) > self.METRICS_CACHE_SIZE:
+                        self._metrics_cache.popitem(last=False)
+                return metrics
+        finally:
+            if not lock.locked() and self._metrics_locks.get(key) is lock:
+                del self._metrics_locks[key]
+
+    @classmethod
+    def _fresh_metrics(cls, key: Tuple[Any, ...]) -> Optional[RiskMetricsData]:
+        """Cached monitoring metrics for key, or None if missing or expired"""
+        with cls._metrics_cache_lock:
+            cached = cls._metrics_cache.get(key)
+            if cached is None or cached[0] <= time.monotonic():
+                return None
+            cls._metrics_cache.move_to_end(key)
+            return cached[1]
+
+    async def _cached_lookup(
+        self, key: Tuple[str, Any], load: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Serve a lookup from the instance TTL cache. Concurrent misses on the
+        same key wait on one load instead of each querying the database.
+        """
+        cached = self._lookup_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        async with self._lookup_locks.setdefault(key, asyncio.Lock()):
+            cached = self._lookup_cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[1]
+            value = await load()
+            self._remember_lookup(key, value)
+            return value
+
+    def _remember_lookup(self, key: Tuple[str, Any], value: Any) -> None:
+        """Store a lookup result, e.g. right after the row was written"""
+        self._lookup_cache[key] = (
+            time.monotonic() + self.LOOKUP_CACHE_TTL_SECONDS,
+            value,
         )
-        result = await self.db.execute(stmt)
-        return result.scalar_one_or_none()
 
     async def _check_risk_thresholds(
         self,
@@ -1226,36 +1784,18 @@ class RiskService:
     ) -> List[Dict[str, Any]]:
         """Check for risk threshold breaches"""
         alerts = []
-        if current_metrics.var_1d > Decimal("0.10"):
-            alerts.append(
-                {
-                    "type": "var_breach",
-                    "severity": "high",
-                    "message": f"Daily VaR exceeds 10%: {current_metrics.var_1d:.2%}",
-                    "current_value": float(current_metrics.var_1d),
-                    "threshold": 0.1,
-                }
-            )
-        if current_metrics.overall_risk_score > Decimal("80.0"):
-            alerts.append(
-                {
-                    "type": "high_risk_score",
-                    "severity": "high",
-                    "message": f"Overall risk score is very high: {current_metrics.overall_risk_score:.1f}",
-                    "current_value": float(current_metrics.overall_risk_score),
-                    "threshold": 80.0,
-                }
-            )
-        if current_metrics.volatility > Decimal("0.50"):
-            alerts.append(
-                {
-                    "type": "high_volatility",
-                    "severity": "medium",
-                    "message": f"Portfolio volatility is very high: {current_metrics.volatility:.2%}",
-                    "current_value": float(current_metrics.volatility),
-                    "threshold": 0.5,
-                }
-            )
+        for metric, threshold, alert_type, severity, template in _RISK_THRESHOLD_ALERTS:
+            value = float(getattr(current_metrics, metric))
+            if value > threshold:
+                alerts.append(
+                    {
+                        "type": alert_type,
+                        "severity": severity,
+                        "message": template.format(value),
+                        "current_value": value,
+                        "threshold": threshold,
+                    }
+                )
         return alerts
 
     async def _check_concentration_limits(
@@ -1263,25 +1803,23 @@ class RiskService:
     ) -> List[Dict[str, Any]]:
         """Check for concentration limit breaches"""
         alerts = []
-        if not portfolio.assets:
-            return alerts
-        total_value = portfolio.total_value or Decimal("0.0")
-        if total_value == 0:
+        arrays = self._asset_arrays(portfolio)
+        if not arrays.symbols or arrays.total_value <= 0:
             return alerts
-        for asset in portfolio.assets:
-            if asset.current_value and total_value > 0:
-                allocation = asset.current_value / total_value
-                if allocation > Decimal("0.50"):
-                    alerts.append(
-                        {
-                            "type": "concentration_limit",
-                            "severity": "high",
-                            "message": f"{asset.symbol} represents {allocation:.1%} of portfolio",
-                            "asset": asset.symbol,
-                            "allocation": float(allocation),
-                            "threshold": 0.5,
-                        }
-                    )
+        allocations = arrays.weights
+        for index in np.flatnonzero(allocations > 0.50).tolist():
+            symbol = arrays.symbols[index]
+            allocation = float(allocations[index])
+            alerts.append(
+                {
+                    "type": "concentration_limit",
+                    "severity": "high",
+                    "message": f"{symbol} represents {allocation:.1%} of portfolio",
+                    "asset": symbol,
+                    "allocation": allocation,
+                    "threshold": 0.5,
+                }
+            )
         return alerts
 
     async def _check_correlation_changes(
@@ -1297,22 +1835,8 @@ class RiskService:
         self, alerts: List[Dict[str, Any]]
     ) -> List[str]:
         """Generate recommendations based on monitoring alerts"""
-        recommendations = []
-        for alert in alerts:
-            if alert["type"] == "var_breach":
-                recommendations.append(
-                    "Reduce position sizes or add hedging to lower VaR"
-                )
-            elif alert["type"] == "high_risk_score":
-                recommendations.append(
-                    "Review portfolio allocation and consider risk reduction"
-                )
-            elif alert["type"] == "high_volatility":
-                recommendations.append(
-                    "Add stable assets or implement volatility reduction strategies"
-                )
-            elif alert["type"] == "concentration_limit":
-                recommendations.append(
-                    f"Reduce allocation to {alert['asset']} to improve diversification"
-                )
-        return recommendations
+        return [
+            _MONITORING_RECOMMENDATIONS[alert["type"]].format_map(alert)
+            for alert in alerts
+            if alert["type"] in _MONITORING_RECOMMENDATIONS
+        ]
@@ -0,0 +1,614 @@
+"""
+Unit tests for risk service VaR and expected shortfall
+"""
+
+import asyncio
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import uuid4
+import numpy as np
+import pytest
+import services.risk.risk_service as risk_module
+from services.risk.risk_service import RiskService
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def reference_tail(returns: np.ndarray, confidence_level: float):
+    """k-th smallest return and mean of the k smallest, via a full sort"""
+    k = min(max(int((1 - confidence_level) * len(returns)), 1), len(returns))
+    ordered = np.sort(returns)
+    return ordered[k - 1], ordered[:k].mean()
+
+
+def make_portfolio(
+    holdings=(("BTC", "cryptocurrency", "600"), ("AAPL", "stock", "400"))
+):
+    """Portfolio stand-in with the attributes the risk service reads"""
+    assets = [
+        SimpleNamespace(
+            symbol=symbol, asset_type=asset_type, current_value=Decimal(value)
+        )
+        for symbol, asset_type, value in holdings
+    ]
+    return SimpleNamespace(
+        id=uuid4(),
+        assets=assets,
+        total_value=sum((asset.current_value for asset in assets), Decimal("0")),
+        updated_at=None,
+    )
+
+
+def reference_stress(portfolio, scenario):
+    """Per-asset stress loss loop the shock matrix replaced"""
+    total_loss = 0.0
+    impacts = []
+    for asset in portfolio.assets:
+        value = float(asset.current_value)
+        shock = scenario.market_shocks.get(
+            asset.asset_type, scenario.market_shocks.get("all", 0.0)
+        )
+        loss = value * abs(shock)
+        total_loss += loss
+        impacts.append((asset.symbol, value, shock * 100, loss, value - loss))
+    return total_loss, total_loss / float(portfolio.total_value) * 100, impacts
+
+
+class TestRiskServiceTailStatistics:
+    """Test cases for historical VaR and expected shortfall"""
+
+    @pytest.fixture
+    def risk_service(self) -> RiskService:
+        return RiskService(AsyncMock(spec=AsyncSession))
+
+    @pytest.fixture
+    def returns(self) -> np.ndarray:
+        return np.random.default_rng(7).normal(0.0005, 0.02, 252)
+
+    @pytest.mark.parametrize("confidence_level", [0.9, 0.95, 0.99])
+    def test_var_and_es_match_sorted_reference(
+        self, risk_service, returns, confidence_level
+    ):
+        """VaR is the k-th order statistic and ES the mean of the k smallest"""
+        var, es = reference_tail(returns, confidence_level)
+        assert risk_service._calculate_historical_var(
+            returns, confidence_level, 1
+        ) == pytest.approx(abs(var), rel=1e-12)
+        assert risk_service._calculate_expected_shortfall(
+            returns, confidence_level
+        ) == pytest.approx(abs(es), rel=1e-12)
+
+    def test_var_scales_with_square_root_of_horizon(self, risk_service, returns):
+        """Multi-day VaR follows the square-root-of-time rule"""
+        one_day = risk_service._calculate_historical_var(returns, 0.95, 1)
+        ten_day = risk_service._calculate_historical_var(returns, 0.95, 10)
+        assert ten_day == pytest.approx(one_day * np.sqrt(10), rel=1e-12)
+
+    @pytest.mark.parametrize("confidence_level", [0.5, 0.95, 0.99])
+    def test_numba_and_numpy_paths_agree(
+        self, risk_service, returns, confidence_level, monkeypatch
+    ):
+        """The numba kernel and the np.partition fallback give the same tail"""
+        pytest.importorskip("numba")
+        jitted = risk_service._tail_statistics(returns, confidence_level)
+        monkeypatch.setattr(risk_module, "HAS_NUMBA", False)
+        fallback = risk_service._tail_statistics(returns, confidence_level)
+        assert jitted[0] == fallback[0]
+        assert jitted[1] == pytest.approx(fallback[1], rel=1e-12)
+
+    def test_read_only_returns_are_accepted(self, risk_service, returns):
+        """Cached return series are read-only and must still be partitioned"""
+        returns.flags.writeable = False
+        var, es = reference_tail(returns, 0.95)
+        assert risk_service._tail_statistics(returns, 0.95) == pytest.approx(
+            (var, es), rel=1e-12
+        )
+
+    @pytest.mark.asyncio
+    async def test_monte_carlo_var_is_the_normal_quantile(self, risk_service, returns):
+        """Monte Carlo VaR returns the limit of sampling a fitted normal"""
+        z = -1.6448536269514722
+        expected = abs(returns.mean() * 5 + z * returns.std() * np.sqrt(5))
+        assert await risk_service._calculate_monte_carlo_var(
+            None, returns, 0.95, 5
+        ) == pytest.approx(expected, rel=1e-9)
+
+    @pytest.mark.asyncio
+    async def test_monte_carlo_var_draws_no_samples(
+        self, risk_service, returns, monkeypatch
+    ):
+        """The closed form needs neither a generator nor a sample buffer"""
+
+        def no_sampling(*args, **kwargs):
+            raise AssertionError("Monte Carlo VaR should not draw samples")
+
+        monkeypatch.setattr(risk_module.np.random, "default_rng", no_sampling)
+        monkeypatch.setattr(risk_module.np, "partition", no_sampling)
+        assert (
+            await risk_service._calculate_monte_carlo_var(None, returns, 0.99, 10) > 0
+        )
+
+    @pytest.mark.parametrize("use_numba", [True, False])
+    def test_small_sample_uses_single_worst_return(
+        self, risk_service, monkeypatch, use_numba
+    ):
+        """With fewer than 1 / (1 - confidence) returns, k is 1"""
+        if use_numba:
+            pytest.importorskip("numba")
+        else:
+            monkeypatch.setattr(risk_module, "HAS_NUMBA", False)
+        returns = np.array([0.01, -0.03, 0.02, -0.01, 0.005])
+        assert risk_service._tail_statistics(returns, 0.95) == (-0.03, -0.03)
+
+    @pytest.mark.parametrize("use_numba", [True, False])
+    def test_order_statistic_is_clamped_to_series_length(
+        self, risk_service, monkeypatch, use_numba
+    ):
+        """A non-positive confidence level selects the whole series"""
+        if use_numba:
+            pytest.importorskip("numba")
+        else:
+            monkeypatch.setattr(risk_module, "HAS_NUMBA", False)
+        returns = np.array([0.03, -0.02, 0.01])
+        var, es = risk_service._tail_statistics(returns, -1.0)
+        assert var == 0.03
+        assert es == pytest.approx(np.mean(returns))
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("confidence_level", [0.0, 1.0, -0.5, 1.5])
+    async def test_calculate_var_rejects_invalid_confidence(
+        self, risk_service, confidence_level
+    ):
+        """Confidence levels outside (0, 1) are rejected before any lookup"""
+        risk_service._get_portfolio_with_assets = AsyncMock()
+        with pytest.raises(ValueError, match="Confidence level"):
+            await risk_service.calculate_var(uuid4(), confidence_level)
+        risk_service._get_portfolio_with_assets.assert_not_called()
+
+
+class TestRiskServiceMetricsCache:
+    """Test cases for the process-wide monitoring metrics cache"""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self, monkeypatch):
+        monkeypatch.setattr(RiskService, "_metrics_cache", OrderedDict())
+        monkeypatch.setattr(RiskService, "_metrics_locks", {})
+
+    @pytest.fixture
+    def portfolio(self):
+        return make_portfolio()
+
+    def make_service(self, metrics) -> RiskService:
+        service = RiskService(AsyncMock(spec=AsyncSession))
+        service._calculate_risk_metrics = AsyncMock(return_value=metrics)
+        return service
+
+    @pytest.mark.asyncio
+    async def test_metrics_are_shared_across_instances(self, portfolio):
+        """A service built for a later request reuses the cached metrics"""
+        first = self.make_service(object())
+        second = self.make_service(object())
+        cached = await first._get_cached_risk_metrics(portfolio)
+        assert await second._get_cached_risk_metrics(portfolio) is cached
+        second._calculate_risk_metrics.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_holdings_change_recomputes(self, portfolio):
+        """A changed position value misses the cache"""
+        service = self.make_service(object())
+        await service._get_cached_risk_metrics(portfolio)
+        portfolio.assets[0].current_value = Decimal("700")
+        await service._get_cached_risk_metrics(portfolio)
+        assert service._calculate_risk_metrics.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded(self, portfolio, monkeypatch):
+        """The least recently used entry is evicted past the size limit"""
+        monkeypatch.setattr(RiskService, "METRICS_CACHE_SIZE", 2)
+        service = self.make_service(object())
+        for _ in range(3):
+            portfolio.id = uuid4()
+            await service._get_cached_risk_metrics(portfolio)
+        assert len(RiskService._metrics_cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_calculate_once(self, portfolio):
+        """Simultaneous polls of one portfolio share a single calculation"""
+        calls = []
+
+        async def calculate(portfolio):
+            calls.append(portfolio.id)
+            await asyncio.sleep(0)
+            return object()
+
+        services = [self.make_service(None) for _ in range(3)]
+        for service in services:
+            service._calculate_risk_metrics = calculate
+        results = await asyncio.gather(
+            *(service._get_cached_risk_metrics(portfolio) for service in services)
+        )
+        assert len(calls) == 1
+        assert results[0] is results[1] is results[2]
+        assert RiskService._metrics_locks == {}
+
+    @pytest.mark.asyncio
+    async def test_monitoring_is_stamped_per_poll(self, portfolio):
+        """Cached metrics do not freeze the monitoring timestamp"""
+        service = RiskService(AsyncMock(spec=AsyncSession))
+        service.market_data_service.get_historical_data = AsyncMock(return_value=[])
+        metrics = await service._calculate_risk_metrics(portfolio)
+        service._calculate_risk_metrics = AsyncMock(
+            return_value=replace(metrics, timestamp=datetime(2020, 1, 1))
+        )
+        service._get_portfolio_with_assets = AsyncMock(return_value=portfolio)
+        service._get_latest_risk_assessment = AsyncMock(return_value=None)
+        stamps = []
+        for _ in range(2):
+            before = datetime.utcnow()
+            result = await service.monitor_portfolio_risk(portfolio.id, uuid4())
+            stamp = datetime.fromisoformat(result["monitoring_timestamp"])
+            assert stamp >= before
+            stamps.append(stamp)
+        assert stamps[1] >= stamps[0]
+        service._calculate_risk_metrics.assert_awaited_once()
+
+
+class TestRiskServiceBatchMetrics:
+    """Test cases for batched risk metrics"""
+
+    @pytest.fixture
+    def risk_service(self) -> RiskService:
+        service = RiskService(AsyncMock(spec=AsyncSession))
+        service.market_data_service.get_historical_data = AsyncMock(return_value=[])
+        return service
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_single_portfolio_path(self, risk_service):
+        """Column-wise reductions give the per-portfolio metrics"""
+        portfolios = [
+            make_portfolio(),
+            make_portfolio((("ETH", "cryptocurrency", "250"), ("BND", "bond", "750"))),
+        ]
+        batch = await risk_service._calculate_risk_metrics_batch(portfolios)
+        assert [metrics.portfolio_id for metrics in batch] == [
+            portfolio.id for portfolio in portfolios
+        ]
+        assert batch[0].timestamp == batch[1].timestamp
+        for portfolio, metrics in zip(portfolios, batch):
+            single = await risk_service._calculate_risk_metrics(portfolio)
+            for field in (
+                "var_1d",
+                "var_5d",
+                "var_30d",
+                "expected_shortfall",
+                "sharpe_ratio",
+                "sortino_ratio",
+                "max_drawdown",
+                "volatility",
+                "concentration_risk",
+                "overall_risk_score",
+            ):
+                assert float(getattr(metrics, field)) == pytest.approx(
+                    float(getattr(single, field)), rel=1e-9
+                ), field
+            assert metrics.risk_grade == single.risk_grade
+
+    @pytest.mark.asyncio
+    async def test_portfolios_without_history_get_defaults(self, risk_service):
+        """Portfolios with no return series fall back to the default metrics"""
+        portfolio = make_portfolio()
+        risk_service._get_portfolio_returns = AsyncMock(return_value=np.empty(0))
+        (metrics,) = await risk_service._calculate_risk_metrics_batch([portfolio])
+        assert metrics.portfolio_id == portfolio.id
+        assert metrics.var_1d == Decimal("0.05")
+        assert metrics.volatility == Decimal("0.15")
+        assert metrics.correlation_symbols == []
+
+
+class TestRiskServiceCorrelationCache:
+    """Test cases for the process-wide correlation caches"""
+
+    @pytest.fixture(autouse=True)
+    def clear_caches(self, monkeypatch):
+        monkeypatch.setattr(RiskService, "_spectrum_cache", OrderedDict())
+        monkeypatch.setattr(RiskService, "_correlation_cache", OrderedDict())
+
+    def make_service(self) -> RiskService:
+        return RiskService(AsyncMock(spec=AsyncSession))
+
+    @pytest.mark.asyncio
+    async def test_spectrum_is_shared_across_instances(self):
+        """A service built for a later request skips the eigh"""
+        portfolio = make_portfolio()
+        symbols = ["BTC", "AAPL"]
+        first = await self.make_service()._get_correlation_spectrum(portfolio, symbols)
+        second_service = self.make_service()
+        second_service._get_asset_returns = AsyncMock()
+        second = await second_service._get_correlation_spectrum(portfolio, symbols)
+        assert second[0] is first[0] and second[1] is first[1]
+        second_service._get_asset_returns.assert_not_called()
+        assert not first[0].flags.writeable and not first[1].flags.writeable
+
+    @pytest.mark.asyncio
+    async def test_spectrum_cache_is_bounded(self, monkeypatch):
+        """The least recently used spectrum is evicted past the size limit"""
+        monkeypatch.setattr(RiskService, "SPECTRUM_CACHE_SIZE", 2)
+        service = self.make_service()
+        for _ in range(3):
+            await service._get_correlation_spectrum(make_portfolio(), ["BTC", "AAPL"])
+        assert len(RiskService._spectrum_cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_correlation_is_shared_across_instances(self):
+        """Scoring a portfolio again from a new service reuses the matrix"""
+        portfolio = make_portfolio()
+        symbols, first = await self.make_service()._calculate_correlation_matrix(
+            portfolio
+        )
+        second_service = self.make_service()
+        second_service._get_correlation_spectrum = AsyncMock()
+        _, second = await second_service._calculate_correlation_matrix(portfolio)
+        assert symbols == ["BTC", "AAPL"]
+        assert second is first
+        assert not first.flags.writeable
+        second_service._get_correlation_spectrum.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_correlation_cache_is_bounded(self, monkeypatch):
+        """The least recently used matrix is evicted past the size limit"""
+        monkeypatch.setattr(RiskService, "CORRELATION_CACHE_SIZE", 2)
+        service = self.make_service()
+        for _ in range(3):
+            await service._calculate_correlation_matrix(make_portfolio())
+        assert len(RiskService._correlation_cache) == 2
+
+
+class TestRiskServiceStressTests:
+    """Test cases for matrix-based stress testing"""
+
+    @pytest.fixture
+    def risk_service(self) -> RiskService:
+        return RiskService(AsyncMock(spec=AsyncSession))
+
+    @pytest.fixture
+    def portfolio(self):
+        return make_portfolio(
+            (
+                ("SPY", "stocks", "400"),
+                ("TLT", "bonds", "300"),
+                ("DOGE", "altcoins", "200"),
+                ("HOUSE", "real_estate", "100"),
+            )
+        )
+
+    @pytest.fixture
+    def quiet_metrics(self):
+        return SimpleNamespace(
+            var_1d=0.0,
+            concentration_risk=0.0,
+            liquidity_risk=0.0,
+            volatility=0.0,
+            sharpe_ratio=1.0,
+        )
+
+    def test_shocks_resolve_by_asset_type_with_all_default(self, risk_service):
+        """Unlisted asset types take the scenario's "all" shock, else none"""
+        asset_types = ("stocks", "bonds", "altcoins", "real_estate")
+        shocks = risk_service._scenario_shocks(asset_types)
+        expected = [
+            [
+                scenario.market_shocks.get(
+                    asset_type, scenario.market_shocks.get("all", 0.0)
+                )
+                for asset_type in asset_types
+            ]
+            for scenario in risk_service.stress_scenarios
+        ]
+        np.testing.assert_array_equal(shocks, expected)
+
+    @pytest.mark.asyncio
+    async def test_scenarios_match_per_asset_formula(self, risk_service, portfolio):
+        """Totals, percentages and impacts equal the per-asset loop"""
+        batch = await risk_service._perform_stress_tests(portfolio, include_detail=True)
+        assert batch.scenario_names == [
+            scenario.name for scenario in risk_service.stress_scenarios
+        ]
+        for index, scenario in enumerate(risk_service.stress_scenarios):
+            total_loss, loss_percentage, impacts = reference_stress(portfolio, scenario)
+            result = batch.results[index]
+            assert batch.losses[index] == pytest.approx(total_loss)
+            assert batch.loss_percentages[index] == pytest.approx(loss_percentage)
+            assert result["portfolio_loss"] == pytest.approx(total_loss)
+            assert result["loss_percentage"] == pytest.approx(loss_percentage)
+            assert result["stressed_portfolio_value"] == pytest.approx(
+                1000.0 - total_loss
+            )
+            columns = result["asset_impacts"]
+            rows = zip(
+                columns["symbols"],
+                columns["current_value"],
+                columns["shock_percentage"],
+                columns["loss_amount"],
+                columns["stressed_value"],
+            )
+            for row, reference in zip(rows, impacts):
+                assert row[0] == reference[0]
+                assert row[1:] == pytest.approx(reference[1:])
+
+    @pytest.mark.asyncio
+    async def test_single_scenario_matches_batch(self, risk_service, portfolio):
+        """perform_stress_test returns the same record as the full run"""
+        risk_service._get_portfolio_with_assets = AsyncMock(return_value=portfolio)
+        batch = await risk_service._perform_stress_tests(portfolio, include_detail=True)
+        result = await risk_service.perform_stress_test(
+            portfolio.id, uuid4(), "Interest Rate Shock"
+        )
+        assert result == batch.results[2]
+
+    @pytest.mark.asyncio
+    async def test_unknown_scenario_is_rejected(self, risk_service, portfolio):
+        """perform_stress_test raises for a scenario name it does not know"""
+        risk_service._get_portfolio_with_assets = AsyncMock(return_value=portfolio)
+        with pytest.raises(ValueError, match="Unknown stress scenario: Alien Invasion"):
+            await risk_service.perform_stress_test(
+                portfolio.id, uuid4(), "Alien Invasion"
+            )
+
+    @pytest.mark.asyncio
+    async def test_failed_scenario_is_excluded_from_recommendations(
+        self, risk_service, quiet_metrics, monkeypatch
+    ):
+        """A scenario whose record fails carries NaN and is never flagged"""
+        portfolio = make_portfolio((("DOGE", "altcoins", "1000"),))
+        batch = await risk_service._perform_stress_tests(portfolio)
+        assert await risk_service._generate_risk_recommendations(
+            quiet_metrics, batch
+        ) == ["Portfolio vulnerable to Crypto Winter - consider hedging strategies"]
+        run_stress_scenario = risk_service._run_stress_scenario
+
+        def failing(context, scenario, *args, **kwargs):
+            if scenario.name == "Crypto Winter":
+                raise RuntimeError("boom")
+            return run_stress_scenario(context, scenario, *args, **kwargs)
+
+        monkeypatch.setattr(risk_service, "_run_stress_scenario", failing)
+        batch = await risk_service._perform_stress_tests(portfolio)
+        assert batch.results[1] == {
+            "scenario_name": "Crypto Winter",
+            "status": "failed",
+            "error": "boom",
+        }
+        assert np.isnan(batch.loss_percentages[1])
+        assert batch.loss_percentages[3] == pytest.approx(25.0)
+        assert (
+            await risk_service._generate_risk_recommendations(quiet_metrics, batch)
+            == []
+        )
+
+    @pytest.mark.asyncio
+    async def test_empty_portfolio_uses_columnar_impacts(self, risk_service):
+        """Portfolios without assets report empty columns, not a symbol dict"""
+        batch = await risk_service._perform_stress_tests(make_portfolio(()))
+        for result in batch.results:
+            assert result["portfolio_loss"] == 0.0
+            assert result["asset_impacts"] == {
+                "symbols": [],
+                "current_value": [],
+                "shock_percentage": [],
+                "loss_amount": [],
+                "stressed_value": [],
+            }
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_numba", [True, False])
+    async def test_batch_losses_match_per_portfolio_runs(
+        self, risk_service, portfolio, monkeypatch, use_numba
+    ):
+        """CSR-packed batch losses equal each portfolio's own stress run"""
+        if use_numba:
+            pytest.importorskip("numba")
+        else:
+            monkeypatch.setattr(risk_module, "HAS_NUMBA", False)
+        portfolios = [
+            portfolio,
+            make_portfolio(()),
+            make_portfolio((("DOGE", "altcoins", "1000"),)),
+        ]
+        losses = await risk_service._perform_stress_tests_batch(portfolios)
+        assert losses.shape == (3, len(risk_service.stress_scenarios))
+        for row, single in zip(losses, portfolios):
+            expected = await risk_service._perform_stress_tests(single)
+            np.testing.assert_allclose(row, expected.losses)
+
+    @pytest.mark.asyncio
+    async def test_batch_runs_on_the_dedicated_stress_worker(
+        self, risk_service, portfolio, monkeypatch
+    ):
+        """Every batch goes through the single-thread stress executor"""
+        threads = []
+        batch_stress_losses = risk_service._batch_stress_losses
+
+        def record_thread(*args):
+            threads.append(threading.current_thread().name)
+            return batch_stress_losses(*args)
+
+        monkeypatch.setattr(risk_service, "_batch_stress_losses", record_thread)
+        await asyncio.gather(
+            *(risk_service._perform_stress_tests_batch([portfolio]) for _ in range(4))
+        )
+        assert RiskService._stress_executor._max_workers == 1
+        assert len(threads) == 4
+        assert all(name.startswith("risk-stress") for name in threads)
+
+
+class TestRiskServiceConcurrency:
+    """Test cases for work overlapping the benchmark fetch"""
+
+    @pytest.fixture(autouse=True)
+    def clear_lookups(self, monkeypatch):
+        monkeypatch.setattr(RiskService, "_spectrum_cache", OrderedDict())
+        monkeypatch.setattr(RiskService, "_correlation_cache", OrderedDict())
+
+    @pytest.fixture
+    def events(self):
+        return []
+
+    @pytest.fixture
+    def risk_service(self, events) -> RiskService:
+        service = RiskService(AsyncMock(spec=AsyncSession))
+
+        async def get_historical_data(*args):
+            events.append("fetch started")
+            await asyncio.sleep(0)
+            events.append("fetch finished")
+            return []
+
+        service.market_data_service.get_historical_data = get_historical_data
+        return service
+
+    def record(self, events, name, method):
+        async def recorded(*args, **kwargs):
+            events.append(name)
+            return await method(*args, **kwargs)
+
+        return recorded
+
+    @pytest.mark.asyncio
+    async def test_stress_tests_run_during_the_benchmark_fetch(
+        self, risk_service, events, monkeypatch
+    ):
+        """assess_portfolio_risk overlaps stress testing with the fetch"""
+        portfolio = make_portfolio()
+        risk_service._get_portfolio_with_assets = AsyncMock(return_value=portfolio)
+        risk_service._persist = AsyncMock()
+        monkeypatch.setattr(
+            risk_module, "RiskAssessment", lambda **fields: SimpleNamespace(**fields)
+        )
+        risk_service._perform_stress_tests = self.record(
+            events, "stress tests", risk_service._perform_stress_tests
+        )
+        assessment = await risk_service.assess_portfolio_risk(portfolio.id, uuid4())
+        assert events == ["fetch started", "stress tests", "fetch finished"]
+        assert len(assessment.stress_test_results) == len(risk_service.stress_scenarios)
+
+    @pytest.mark.asyncio
+    async def test_holdings_metrics_run_during_the_benchmark_fetch(
+        self, risk_service, events
+    ):
+        """Beta's fetch is in flight while the holdings-based metrics run"""
+        names = ("concentration", "liquidity", "credit", "correlation")
+        for name in names:
+            attribute = (
+                "_calculate_correlation_matrix"
+                if name == "correlation"
+                else f"_calculate_{name}_risk"
+            )
+            method = getattr(risk_service, attribute)
+            setattr(risk_service, attribute, self.record(events, name, method))
+        metrics = await risk_service._calculate_risk_metrics(make_portfolio())
+        assert events == ["fetch started", *names, "fetch finished"]
+        assert metrics.correlation_symbols == ["BTC", "AAPL"]